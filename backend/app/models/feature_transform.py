@@ -0,0 +1,84 @@
+"""
+Feature engineering shared by training and serving.
+
+`FeatureTransform` turns raw feature rows into the model's input matrix with
+plain NumPy. Its fitted statistics are stored in the model manifest, so the
+API computes exactly the features the model was trained on, whether it
+predicts one row or a batch.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Raw inputs, as gathered at serving time and loaded for training
+RAW_FEATURES: List[str] = [
+    "Altitude",
+    "Rainfall_Intensity",
+    "Temperature",
+    "Humidity",
+    "River_Level",
+    "Latitude",
+    "Longitude",
+    "flood_proximity_score",
+]
+ENGINEERED_FEATURES: List[str] = ["rainfall_anomaly", "is_monsoon"]
+MODEL_FEATURES: List[str] = RAW_FEATURES + ENGINEERED_FEATURES
+
+MONSOON_LAT_RANGE = (11.0, 19.0)
+
+# Models published before the transform was saved with them were served with
+# this rainfall mean, so keep it as their fallback.
+LEGACY_RAINFALL_MEAN = 50.0
+
+_RAW_INDEX = {name: i for i, name in enumerate(RAW_FEATURES)}
+_RAIN = _RAW_INDEX["Rainfall_Intensity"]
+_LAT = _RAW_INDEX["Latitude"]
+
+
+class FeatureTransform:
+    """Fitted feature engineering: raw rows in, model-ordered float matrix out."""
+
+    def __init__(self, rainfall_mean: float = LEGACY_RAINFALL_MEAN, output_features: Optional[Sequence[str]] = None):
+        self.rainfall_mean = float(rainfall_mean)
+        self.output_features: List[str] = list(output_features or MODEL_FEATURES)
+        unknown = [name for name in self.output_features if name not in _RAW_INDEX and name not in ENGINEERED_FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown model features: {unknown}")
+        # Where each output column comes from: a raw column index, or an engineered feature name
+        self._plan = [_RAW_INDEX.get(name, name) for name in self.output_features]
+
+    @classmethod
+    def fit(cls, raw: np.ndarray, output_features: Optional[Sequence[str]] = None) -> "FeatureTransform":
+        """Fit on a raw training matrix laid out as RAW_FEATURES."""
+        return cls(rainfall_mean=float(np.nanmean(raw[:, _RAIN])), output_features=output_features)
+
+    @staticmethod
+    def records_to_raw(records: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Raw matrix from feature dicts; missing values become 0."""
+        raw = np.array([[r.get(name) for name in RAW_FEATURES] for r in records], dtype=float)
+        return np.nan_to_num(raw, nan=0.0)
+
+    def transform(self, raw: np.ndarray) -> np.ndarray:
+        raw = np.nan_to_num(np.asarray(raw, dtype=float), nan=0.0)
+        engineered = {
+            "rainfall_anomaly": raw[:, _RAIN] - self.rainfall_mean,
+            "is_monsoon": ((raw[:, _LAT] >= MONSOON_LAT_RANGE[0]) & (raw[:, _LAT] <= MONSOON_LAT_RANGE[1])).astype(float),
+        }
+        out = np.zeros((raw.shape[0], len(self._plan)), dtype=float)
+        for col, source in enumerate(self._plan):
+            if isinstance(source, int):
+                out[:, col] = raw[:, source]
+            else:
+                out[:, col] = engineered[source]
+        return out
+
+    def transform_records(self, records: Sequence[Dict[str, Any]]) -> np.ndarray:
+        return self.transform(self.records_to_raw(records))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"rainfall_mean": self.rainfall_mean, "output_features": self.output_features}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeatureTransform":
+        return cls(rainfall_mean=data["rainfall_mean"], output_features=data.get("output_features"))
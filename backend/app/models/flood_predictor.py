@@ -1,77 +1,98 @@
-import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import joblib
-import pandas as pd
+import numpy as np
 
-_ARTIFACTS_DIR = "data/ml-artifacts"
-_MODEL_PATH = os.path.join(_ARTIFACTS_DIR, "model.pkl")
-_SCALER_PATH = os.path.join(_ARTIFACTS_DIR, "scaler.pkl")
-_FEATURES_PATH = os.path.join(_ARTIFACTS_DIR, "model_features.pkl")
+from app.models.feature_transform import FeatureTransform
+from app.utils.metrics import timed
+from config.settings import FEATURES_PATH, MODEL_PATH, SCALER_PATH
 
 
 class FloodPredictor:
     """Load the trained Bangalore + Karnataka flood prediction model and make predictions."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        model_path: str = MODEL_PATH,
+        scaler_path: str = SCALER_PATH,
+        features: Optional[List[str]] = None,
+        features_path: str = FEATURES_PATH,
+        version: Optional[str] = None,
+        transform: Optional[Dict[str, Any]] = None,
+    ):
         self._model = None
         self._scaler = None
         self._feature_names: List[str] = []
+        self._transform: Optional[FeatureTransform] = None
+        self._scale_mean: Optional[np.ndarray] = None
+        self._scale_std: Optional[np.ndarray] = None
+        self.version = version
         self.is_ready = False
 
-        print("--- Initializing FloodPredictor ---")
+        print(f"--- Initializing FloodPredictor ({version or model_path}) ---")
         try:
-            self._model = joblib.load(_MODEL_PATH)
-            self._scaler = joblib.load(_SCALER_PATH)
-            self._feature_names = joblib.load(_FEATURES_PATH)
+            self._model = joblib.load(model_path)
+            self._scaler = joblib.load(scaler_path)
+            self._feature_names = list(features) if features is not None else joblib.load(features_path)
+            for name, artifact in (("model", self._model), ("scaler", self._scaler)):
+                expected = getattr(artifact, "n_features_in_", None)
+                if expected is not None and expected != len(self._feature_names):
+                    raise ValueError(f"{name} expects {expected} features, feature list has {len(self._feature_names)}")
+            self._transform = (
+                FeatureTransform.from_dict({**transform, "output_features": self._feature_names})
+                if transform
+                else FeatureTransform(output_features=self._feature_names)
+            )
+            # StandardScaler is applied as plain NumPy on the hot path
+            mean, std = getattr(self._scaler, "mean_", None), getattr(self._scaler, "scale_", None)
+            if mean is not None and std is not None:
+                self._scale_mean, self._scale_std = np.asarray(mean), np.asarray(std)
             self.is_ready = True
             print(f"✅ Model loaded with {len(self._feature_names)} features.")
         except Exception as e:
             print(f"🚨 Error loading model artifacts: {e}")
 
-    def _prepare_dataframe(self, input_data: List[Dict[str, Any]]) -> pd.DataFrame:
-        df = pd.DataFrame(input_data)
-
-        # Ensure all required features exist
-        for f in self._feature_names:
-            if f not in df.columns:
-                df[f] = 0  # default to 0 if missing
-
-        # Keep only model features
-        df = df[self._feature_names].copy()
-
-        # Add engineered features if missing
-        if "rainfall_anomaly" not in df.columns and "Rainfall_Intensity" in df.columns:
-            df["rainfall_anomaly"] = (
-                df["Rainfall_Intensity"] - df["Rainfall_Intensity"].mean()
-            )
-        if "is_monsoon" not in df.columns and "Latitude" in df.columns:
-            df["is_monsoon"] = df["Latitude"].apply(
-                lambda lat: 1 if 11 <= lat <= 19 else 0
-            )
+    def warm_up(self) -> bool:
+        """Run one prediction so lazy initialisation happens before live traffic."""
+        if not self.is_ready:
+            return False
+        try:
+            scaled = self._prepare_matrix([{}])
+            self._model.predict(scaled)  # type: ignore
+            if hasattr(self._model, "predict_proba"):
+                self._model.predict_proba(scaled)  # type: ignore
+            return True
+        except Exception as e:
+            print(f"🚨 Model warm-up failed: {e}")
+            return False
 
-        df.fillna(0, inplace=True)
-        scaled = self._scaler.transform(df)  # type: ignore
-        return scaled
+    def _prepare_matrix(self, input_data: List[Dict[str, Any]]) -> np.ndarray:
+        """Raw feature dicts -> engineered, scaled matrix in the model's feature order."""
+        X = self._transform.transform_records(input_data)  # type: ignore
+        if self._scale_std is None:
+            return self._scaler.transform(X)  # type: ignore
+        return (X - self._scale_mean) / self._scale_std
 
+    @timed("model.predict")
     def predict(self, input_data: List[Dict[str, Any]]) -> List[str]:
         if not self.is_ready:
             return ["Unknown"] * len(input_data)
         try:
-            scaled = self._prepare_dataframe(input_data)
+            scaled = self._prepare_matrix(input_data)
             preds = self._model.predict(scaled)  # type: ignore
             return ["Low" if p == 0 else "High" for p in preds]
         except Exception as e:
             print(f"🚨 Prediction error: {e}")
             return ["Unknown"] * len(input_data)
 
+    @timed("model.predict_proba")
     def predict_proba(self, input_data: List[Dict[str, Any]]) -> List[float]:
         if not self.is_ready:
             return [0.5] * len(input_data)
         try:
             if not hasattr(self._model, "predict_proba"):
                 return [0.5] * len(input_data)
-            scaled = self._prepare_dataframe(input_data)
+            scaled = self._prepare_matrix(input_data)
             proba = self._model.predict_proba(scaled)  # type: ignore
             return [p[1] for p in proba]  # probability of "High"
         except Exception as e:
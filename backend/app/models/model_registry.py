@@ -0,0 +1,173 @@
+"""
+Versioned model registry with hot-swap reloading.
+
+Each version lives in its own directory under the registry root:
+
+    registry/
+      CURRENT                     # name of the promoted version
+      20240601-120000/
+        manifest.json             # features, metrics, artifact file names
+        model.pkl
+        scaler.pkl
+
+The API's `ModelManager` polls CURRENT, loads and warms up a newly promoted
+version in a worker thread, then swaps a single reference. Requests already
+holding the old predictor finish on it; none are dropped or see a half-loaded model.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+
+from app.models.flood_predictor import FloodPredictor
+from config.settings import MODEL_REGISTRY_DIR, MODEL_RELOAD_INTERVAL_SECONDS
+
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+
+
+class ModelRegistry:
+    """Directory-backed store of immutable model versions."""
+
+    def __init__(self, root: str = MODEL_REGISTRY_DIR):
+        self.root = Path(root)
+
+    def versions(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / MANIFEST_FILE).exists())
+
+    def manifest(self, version: str) -> Dict[str, Any]:
+        return json.loads((self.root / version / MANIFEST_FILE).read_text(encoding="utf-8"))
+
+    def current_version(self) -> Optional[str]:
+        path = self.root / CURRENT_FILE
+        if not path.exists():
+            return None
+        version = path.read_text(encoding="utf-8").strip()
+        return version or None
+
+    def publish(
+        self,
+        model: Any,
+        scaler: Any,
+        features: List[str],
+        metrics: Optional[Dict[str, Any]] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        promote: bool = True,
+    ) -> str:
+        """Write a new version; it only becomes visible once fully on disk."""
+        version = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        staging = self.root / f".{version}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        joblib.dump(model, staging / "model.pkl")
+        joblib.dump(scaler, staging / "scaler.pkl")
+        manifest = {
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "model_file": "model.pkl",
+            "scaler_file": "scaler.pkl",
+            "features": list(features),
+            "metrics": metrics or {},
+            **(extra or {}),
+        }
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        staging.rename(self.root / version)
+
+        if promote:
+            self.promote(version)
+        return version
+
+    def promote(self, version: str) -> None:
+        """Atomically point CURRENT at an existing version (also used for rollback)."""
+        if version not in self.versions():
+            raise ValueError(f"Unknown model version: {version}")
+        tmp_path = self.root / f"{CURRENT_FILE}.tmp"
+        tmp_path.write_text(version, encoding="utf-8")
+        os.replace(tmp_path, self.root / CURRENT_FILE)
+
+    def load(self, version: str) -> FloodPredictor:
+        manifest = self.manifest(version)
+        version_dir = self.root / version
+        return FloodPredictor(
+            model_path=str(version_dir / manifest["model_file"]),
+            scaler_path=str(version_dir / manifest["scaler_file"]),
+            features=manifest["features"],
+            version=version,
+            transform=manifest.get("feature_transform"),
+        )
+
+
+class ModelManager:
+    """Holds the live predictor and swaps in newly promoted registry versions."""
+
+    def __init__(self, registry: ModelRegistry, reload_interval: int = MODEL_RELOAD_INTERVAL_SECONDS):
+        self.registry = registry
+        self.reload_interval = reload_interval
+        self.predictor: Optional[FloodPredictor] = None
+        self.loaded_at: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.predictor.version if self.predictor else None
+
+    async def start(self) -> None:
+        """Load the promoted version, or the fallback artifacts if the registry is empty."""
+        if await self.reload():
+            return
+        predictor = await asyncio.to_thread(FloodPredictor)
+        if not await asyncio.to_thread(predictor.warm_up):
+            print("⚠️ No usable model (registry empty, fallback artifacts failed); assessing with thresholds only")
+            return
+        self._swap(predictor)
+
+    async def reload(self) -> bool:
+        """Load CURRENT if it differs from the live version. Returns True if a swap happened."""
+        async with self._lock:
+            version = await asyncio.to_thread(self.registry.current_version)
+            if not version or version == self.version:
+                return False
+
+            candidate = await asyncio.to_thread(self.registry.load, version)
+            if not candidate.is_ready or not await asyncio.to_thread(candidate.warm_up):
+                print(f"⚠️ Model version {version} failed to load; keeping {self.version or 'current model'}")
+                return False
+
+            self._swap(candidate)
+            print(f"✅ Switched to model version {version}")
+            return True
+
+    def _swap(self, predictor: FloodPredictor) -> None:
+        # A single reference assignment: readers see either the old or the new model.
+        self.predictor = predictor
+        self.loaded_at = datetime.now(timezone.utc)
+
+    async def watch(self) -> None:
+        """Poll the registry for promotions until cancelled."""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                print(f"⚠️ Model reload check failed: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "is_ready": bool(self.predictor and self.predictor.is_ready),
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "available_versions": self.registry.versions(),
+        }
+
+
+# Global model manager
+model_manager = ModelManager(ModelRegistry())
@@ -80,6 +80,19 @@ class Alert(BaseModel):
         from_attributes = True
         allow_population_by_field_name = True
 
+# --- Pagination Models ---
+
+class ReportPage(BaseModel):
+    """A page of reports, newest first."""
+    items: List[Report]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+
+
+class AlertPage(BaseModel):
+    """A page of alerts, newest first."""
+    items: List[Alert]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+
 # --- Risk Assessment Models ---
 
 class RiskAssessmentDetails(BaseModel):
@@ -88,6 +101,8 @@ class RiskAssessmentDetails(BaseModel):
     ml_assessment: RiskLevel
     user_reports_found: int
     weather_data_found: bool
+    weather_stale: bool = Field(False, description="Weather came from the last known reading for the area, not a live fetch")
+    weather_age_seconds: Optional[float] = Field(None, description="Age of the weather reading used")
     contributing_factors: List[str] = Field(..., description="List of factors contributing to the risk assessment")
     recommendation: str = Field(..., description="Recommendation based on the final risk level")
     error: Optional[str] = None
@@ -112,6 +127,8 @@ class PredictionResult(BaseModel):
     ml_assessment: RiskLevel = Field(..., description="Risk level predicted by the machine learning model.")
     user_reports_found: int = Field(..., description="Number of recent user reports contributing to the assessment.")
     weather_data_found: bool = Field(..., description="Indicates if relevant weather data was available for ML prediction.")
+    weather_stale: bool = Field(False, description="True if the weather used is the last known reading for the area rather than a live fetch.")
+    weather_age_seconds: Optional[float] = Field(None, description="Age of the weather reading used, in seconds.")
     contributing_factors: List[str] = Field(..., description="Detailed list of factors that informed the final risk level.")
     recommendation: str = Field(..., description="Actionable advice based on the final risk level.")
     error: Optional[str] = Field(None, description="Any error message encountered during the prediction process.")
@@ -156,6 +173,14 @@ class MapPoint(BaseModel):
     details: str
 
 
+class MapCluster(BaseModel):
+    """Grid cluster of reports for the dashboard map."""
+    latitude: float = Field(..., description="Centroid latitude of the reports in the cell")
+    longitude: float = Field(..., description="Centroid longitude of the reports in the cell")
+    count: int = Field(..., description="Number of reports in the cell")
+    risk_level: RiskLevel = Field(..., description="Highest risk level among the reports in the cell")
+
+
 class DashboardResponse(BaseModel):
     """Dashboard data response model."""
     map_points: List[MapPoint]
@@ -0,0 +1,134 @@
+"""
+Alert aggregation: coalesces repeated alerts for the same area.
+
+Reports from one waterlogged junction arrive in bursts. Only the first alert
+for an area within the dedup window is generated; later ones are absorbed
+unless the risk level rises, in which case an escalated alert goes out.
+
+Active alerts live in MongoDB (one document per area, keyed by the area), so
+every worker process shares them: a claim is a single conditional upsert,
+and when two workers race for the same area the unique _id lets only one win.
+Each process also remembers the areas it has seen claimed for a short TTL, so
+a burst of repeat reports for a claimed area is coalesced without a round trip.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.models.schemas import RiskLevel
+from app.utils.database import db
+from config.settings import (
+    ALERT_AREA_CACHE_MAX_ENTRIES,
+    ALERT_AREA_CACHE_SECONDS,
+    ALERT_AREA_PRECISION,
+    ALERT_DEDUP_WINDOW_MINUTES,
+)
+
+_RISK_RANK = {
+    RiskLevel.UNKNOWN: -1,
+    RiskLevel.LOW: 0,
+    RiskLevel.MEDIUM: 1,
+    RiskLevel.HIGH: 2,
+}
+
+
+class AreaClaim(NamedTuple):
+    """A won claim on an area, kept until its alert is saved."""
+
+    area_key: str
+    owner: str
+    # The lower-level alert an escalation replaced, restored if the escalation isn't saved
+    previous: Optional[Dict[str, Any]]
+
+
+class AlertAggregator:
+    """Active alerts keyed by area, shared by all processes through one collection."""
+
+    def __init__(
+        self,
+        collection_name: str = "alert_areas",
+        window_minutes: int = ALERT_DEDUP_WINDOW_MINUTES,
+        precision: int = ALERT_AREA_PRECISION,
+        cache_seconds: int = ALERT_AREA_CACHE_SECONDS,
+        cache_max_entries: int = ALERT_AREA_CACHE_MAX_ENTRIES,
+    ):
+        self.collection_name = collection_name
+        self.window = timedelta(minutes=window_minutes)
+        self.precision = precision
+        self.cache_seconds = min(cache_seconds, window_minutes * 60)
+        self.cache_max_entries = cache_max_entries
+        # area key -> (monotonic expiry, rank, owner) of an alert known to be active
+        self._active: "OrderedDict[str, Tuple[float, int, Optional[str]]]" = OrderedDict()
+
+    @property
+    def collection(self):
+        return db.get_collection(self.collection_name)
+
+    def area_key(self, lat: float, lon: float) -> str:
+        return f"{lat:.{self.precision}f},{lon:.{self.precision}f}"
+
+    def _cached_active(self, key: str, rank: int, owner: str) -> bool:
+        """True if this process saw an equal or higher alert claimed by someone else, recently."""
+        entry = self._active.get(key)
+        if entry is None:
+            return False
+        if entry[0] <= time.monotonic():
+            del self._active[key]
+            return False
+        return entry[1] >= rank and entry[2] != owner
+
+    def _remember(self, key: str, rank: int, owner: Optional[str]) -> None:
+        self._active[key] = (time.monotonic() + self.cache_seconds, rank, owner)
+        self._active.move_to_end(key)
+        while len(self._active) > self.cache_max_entries:
+            self._active.popitem(last=False)
+
+    async def claim(self, lat: float, lon: float, risk_level: RiskLevel, owner: str) -> Optional[AreaClaim]:
+        """
+        Claim the area for a new alert, or return None when an alert of the
+        same or higher risk is still active. `owner` (e.g. the job id) wins
+        again if it retries, so a job that died after claiming still alerts.
+        """
+        key = self.area_key(lat, lon)
+        rank = _RISK_RANK[risk_level]
+        if self._cached_active(key, rank, owner):
+            return None
+
+        now = datetime.now(timezone.utc)
+        try:
+            previous = await self.collection.find_one_and_update(
+                {
+                    "_id": key,
+                    "$or": [{"expires_at": {"$lte": now}}, {"rank": {"$lt": rank}}, {"owner": owner}],
+                },
+                {"$set": {"risk_level": risk_level.value, "rank": rank, "owner": owner, "expires_at": now + self.window}},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            # The area's document exists but didn't match: an equal or higher alert is active.
+            self._remember(key, rank, None)
+            return None
+        self._remember(key, rank, owner)
+        if previous is not None and previous.get("owner") == owner:
+            previous = None
+        return AreaClaim(key, owner, previous)
+
+    async def release(self, claim: AreaClaim) -> None:
+        """Undo a claim whose alert could not be saved, so the next report can retry."""
+        self._active.pop(claim.area_key, None)
+        mine = {"_id": claim.area_key, "owner": claim.owner}
+        if claim.previous is not None:
+            # An escalation failed: put back the alert it replaced (ignored once expired).
+            await self.collection.replace_one(mine, claim.previous)
+        else:
+            await self.collection.delete_one(mine)
+
+
+# Global aggregator instance
+alert_aggregator = AlertAggregator()
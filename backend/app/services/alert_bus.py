@@ -0,0 +1,177 @@
+"""
+In-process publish/subscribe bus for newly created alerts.
+
+Alert writers publish once; WebSocket and Server-Sent Events clients each get
+a bounded queue, and in-process listeners (caches, metrics) get a callback.
+Alerts are written by worker.py and other API workers too, so the API follows
+the alerts collection: by polling for new _ids by default, or through a
+MongoDB change stream (replica sets only) with ALERT_CHANGE_STREAM enabled.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from bson import ObjectId
+
+from config.settings import (
+    ALERT_CHANGE_STREAM,
+    ALERT_POLL_INTERVAL_SECONDS,
+    ALERT_POLL_LOOKBACK_SECONDS,
+    ALERT_STREAM_QUEUE_SIZE,
+)
+
+AlertPayload = Dict[str, Any]
+
+logger = logging.getLogger("RainSafe")
+
+
+class AlertBus:
+    """Fans out alert payloads to subscriber queues and listener callbacks."""
+
+    def __init__(self, queue_size: int = ALERT_STREAM_QUEUE_SIZE, use_change_stream: bool = ALERT_CHANGE_STREAM):
+        self.queue_size = queue_size
+        self.use_change_stream = use_change_stream
+        # Set while a follower publishes every insert on the alerts collection
+        self.following = False
+        self._subscribers: Set["asyncio.Queue[AlertPayload]"] = set()
+        self._listeners: List[Callable[[AlertPayload], None]] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def add_listener(self, callback: Callable[[AlertPayload], None]) -> None:
+        """Register a synchronous callback invoked for every published alert."""
+        self._listeners.append(callback)
+
+    def subscribe(self) -> "asyncio.Queue[AlertPayload]":
+        queue: "asyncio.Queue[AlertPayload]" = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: "asyncio.Queue[AlertPayload]") -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, alert: AlertPayload) -> None:
+        """Deliver an alert without blocking; slow subscribers lose their oldest item."""
+        for callback in self._listeners:
+            try:
+                callback(alert)
+            except Exception as e:
+                logger.warning(f"⚠️ Alert listener failed: {e}")
+        for queue in list(self._subscribers):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(alert)
+
+    def announce(self, alert: AlertPayload) -> None:
+        """
+        Publish an alert inserted by this process. Skipped while following
+        the collection, since the follower will deliver the same insert.
+        """
+        if not self.following:
+            self.publish(alert)
+
+    async def start_point(self, database) -> Optional[Any]:
+        """
+        The cluster time to open the change stream at. Taken before the
+        initial read of alerts (the recent-alerts warm-up), so nothing
+        inserted in between is missed; None when polling or unavailable.
+        """
+        if not self.use_change_stream:
+            return None
+        try:
+            return (await database.command("ping")).get("operationTime")
+        except Exception:
+            return None
+
+    async def follow(
+        self,
+        collection,
+        to_payload: Callable[[Dict[str, Any]], AlertPayload],
+        seen_ids: Iterable[str] = (),
+        start_at: Optional[Any] = None,
+    ) -> None:
+        """
+        Publish every insert on `collection` until cancelled, by change stream
+        or polling. `seen_ids` are alerts already delivered by the initial
+        read; they are skipped where the follower overlaps it.
+        """
+        if self.use_change_stream:
+            await self.follow_change_stream(collection, to_payload, seen_ids, start_at)
+        await self.poll_inserts(collection, to_payload, seen_ids)
+
+    async def follow_change_stream(
+        self,
+        collection,
+        to_payload: Callable[[Dict[str, Any]], AlertPayload],
+        seen_ids: Iterable[str] = (),
+        start_at: Optional[Any] = None,
+    ) -> None:
+        """Publish every insert on `collection`; returns if the stream is unavailable."""
+        seen_ids = set(seen_ids)
+        options: Dict[str, Any] = {"full_document": "updateLookup"}
+        if start_at is not None:
+            options["start_at_operation_time"] = start_at
+        try:
+            async with collection.watch([{"$match": {"operationType": "insert"}}], **options) as stream:
+                self.following = True
+                logger.info("✅ Following alerts change stream")
+                async for change in stream:
+                    doc = change["fullDocument"]
+                    if str(doc["_id"]) in seen_ids:
+                        continue
+                    try:
+                        self.publish(to_payload(doc))
+                    except Exception as e:
+                        logger.warning(f"⚠️ Skipping malformed alert from change stream: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ Alerts change stream unavailable, polling instead: {e}")
+
+    async def poll_inserts(
+        self,
+        collection,
+        to_payload: Callable[[Dict[str, Any]], AlertPayload],
+        seen_ids: Iterable[str] = (),
+        interval_seconds: float = ALERT_POLL_INTERVAL_SECONDS,
+        lookback_seconds: float = ALERT_POLL_LOOKBACK_SECONDS,
+    ) -> None:
+        """
+        Publish inserts on `collection` found by polling for recent _ids.
+
+        ObjectIds carry the inserting client's clock, so across processes they
+        only roughly follow insert order. Each poll re-reads the last
+        `lookback_seconds` of _ids and skips the ones already published.
+        """
+        self.following = True
+        lookback = timedelta(seconds=lookback_seconds)
+        seen: Dict[ObjectId, datetime] = {}  # _id -> its timestamp
+        for _id in map(ObjectId, seen_ids):
+            seen[_id] = _id.generation_time
+        logger.info("✅ Polling alerts collection for new alerts")
+        while True:
+            try:
+                start = datetime.now(timezone.utc) - lookback
+                async for doc in collection.find({"_id": {"$gt": ObjectId.from_datetime(start)}}).sort("_id", 1):
+                    if doc["_id"] in seen:
+                        continue
+                    seen[doc["_id"]] = doc["_id"].generation_time
+                    try:
+                        self.publish(to_payload(doc))
+                    except Exception as e:
+                        logger.warning(f"⚠️ Skipping malformed alert from alerts poll: {e}")
+                # Ids older than the window won't be read again.
+                seen = {_id: at for _id, at in seen.items() if at > start}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Alerts poll failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+# Global alert bus instance
+alert_bus = AlertBus()
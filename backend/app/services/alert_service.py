@@ -0,0 +1,86 @@
+"""
+Risk assessment and alert generation for new reports.
+
+Runs in worker.py as the handler of "assess_and_alert" jobs queued by
+POST /report, so the ML prediction, reverse geocoding and alert insert stay
+off the API's event loop. Failures propagate to the job queue for retry.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.models.flood_predictor import FloodPredictor
+from app.models.schemas import Alert, AssessmentSource, RiskLevel
+from app.services.alert_aggregator import alert_aggregator
+from app.services.alert_bus import alert_bus
+from app.services.risk_service import RiskAssessmentService
+from app.utils.database import db
+from app.utils.geocoder import reverse_geocode
+from app.utils.metrics import timed
+
+logger = logging.getLogger("RainSafe")
+
+
+def alert_payload(alert: Alert) -> Dict[str, Any]:
+    """JSON-ready alert, shaped like the /alerts/recent response items."""
+    return alert.model_dump(mode="json", by_alias=True)
+
+
+async def generate_alert(
+    lat: float, lon: float, risk_level: RiskLevel, description: str, claim_owner: str
+) -> Optional[Alert]:
+    # Coalesce with an active alert for this area unless the risk has risen
+    claim = await alert_aggregator.claim(lat, lon, risk_level, claim_owner)
+    if claim is None:
+        logger.info(f"ℹ️ Coalesced {risk_level.value} alert for area {alert_aggregator.area_key(lat, lon)} into the active alert")
+        return None
+
+    location_name = await reverse_geocode(lat, lon)
+
+    if risk_level == RiskLevel.HIGH:
+        message = f"Severe Flood Warning in {location_name}: {description}. Immediate action advised."
+    elif risk_level == RiskLevel.MEDIUM:
+        message = f"Moderate Flood Risk in {location_name}: {description}. Exercise caution."
+    else:
+        message = f"Flood Warning: {description}. Risk Level: {risk_level.value}."
+
+    alert_record = {
+        "location_name": location_name,
+        "risk_level": risk_level,
+        "message": message,
+        "recipient": "all-subscribers-in-area",
+        "source": AssessmentSource.HYBRID_HISTORICAL,
+        "sent_at": datetime.now(timezone.utc),
+    }
+
+    try:
+        result = await db.get_collection("alerts").insert_one(alert_record)
+    except Exception as e:
+        logger.error(f"❌ Error saving alert: {e}")
+        # Let the next report for the area claim it again.
+        try:
+            await alert_aggregator.release(claim)
+        except Exception as release_e:
+            logger.error(f"❌ Could not release alert area {claim.area_key}: {release_e}")
+        raise
+    alert_record["_id"] = str(result.inserted_id)
+    logger.info(f"✅ Alert generated: {message}")
+    alert = Alert(**alert_record)
+    alert_bus.announce(alert_payload(alert))
+    return alert
+
+
+@timed("background.assess_and_alert")
+async def assess_and_alert(
+    lat: float, lon: float, description: str, claim_owner: str, predictor: Optional[FloodPredictor] = None
+) -> Optional[Alert]:
+    """
+    Assess the risk at a reported location and alert the area if it is Medium
+    or High. `claim_owner` identifies the caller (the job) to the aggregator.
+    """
+    risk_service = RiskAssessmentService(database=db, predictor=predictor)
+    prediction = await risk_service.get_risk_prediction(lat=lat, lon=lon)
+    if prediction.final_risk in [RiskLevel.MEDIUM, RiskLevel.HIGH]:
+        return await generate_alert(lat, lon, prediction.final_risk, description, claim_owner)
+    return None
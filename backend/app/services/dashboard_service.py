@@ -0,0 +1,179 @@
+"""
+MongoDB aggregation pipelines behind the dashboard endpoints.
+
+Risk classification of reports by water level happens inside MongoDB, so
+stats are exact over the whole time window and only the fields a map point
+(or, in cluster mode, a grid cluster) needs are sent back to the API.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.schemas import AssessmentSource, RiskLevel
+from config.settings import DASHBOARD_CLUSTER_CELLS_PER_TILE, RISK_THRESHOLDS
+
+HIGH_WATER_LEVELS: List[str] = RISK_THRESHOLDS["HIGH_WATER_LEVEL"]
+MEDIUM_WATER_LEVELS: List[str] = RISK_THRESHOLDS["MEDIUM_WATER_LEVEL"]
+
+# $switch expression mapping a report's water_level to a RiskLevel value.
+RISK_LEVEL_EXPR: Dict[str, Any] = {
+    "$switch": {
+        "branches": [
+            {"case": {"$in": ["$water_level", HIGH_WATER_LEVELS]}, "then": RiskLevel.HIGH.value},
+            {"case": {"$in": ["$water_level", MEDIUM_WATER_LEVELS]}, "then": RiskLevel.MEDIUM.value},
+        ],
+        "default": RiskLevel.LOW.value,
+    }
+}
+
+# Numeric rank so clusters can take the $max risk of their reports.
+RISK_RANK_EXPR: Dict[str, Any] = {
+    "$switch": {
+        "branches": [
+            {"case": {"$in": ["$water_level", HIGH_WATER_LEVELS]}, "then": 2},
+            {"case": {"$in": ["$water_level", MEDIUM_WATER_LEVELS]}, "then": 1},
+        ],
+        "default": 0,
+    }
+}
+
+
+def classify_water_level(water_level: Optional[str]) -> RiskLevel:
+    """Python twin of RISK_LEVEL_EXPR, for single reports at write time."""
+    water_level = getattr(water_level, "value", water_level)
+    if water_level in HIGH_WATER_LEVELS:
+        return RiskLevel.HIGH
+    if water_level in MEDIUM_WATER_LEVELS:
+        return RiskLevel.MEDIUM
+    return RiskLevel.LOW
+
+
+BBox = Tuple[float, float, float, float]  # min_lon, min_lat, max_lon, max_lat
+
+
+def parse_bbox(bbox: Optional[str]) -> Optional[BBox]:
+    """Parse a `min_lon,min_lat,max_lon,max_lat` query value."""
+    if not bbox:
+        return None
+    parts = [float(v) for v in bbox.split(",")]
+    if len(parts) != 4 or parts[0] > parts[2] or parts[1] > parts[3]:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    return parts[0], parts[1], parts[2], parts[3]
+
+
+def bbox_match(bbox: BBox) -> Dict[str, Any]:
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return {
+        "latitude": {"$gte": min_lat, "$lte": max_lat},
+        "longitude": {"$gte": min_lon, "$lte": max_lon},
+    }
+
+
+def cluster_cell_degrees(zoom: int) -> float:
+    """Grid cell size in degrees so each cluster covers a fixed share of a web-map tile."""
+    return 360.0 / (2 ** zoom) / DASHBOARD_CLUSTER_CELLS_PER_TILE
+
+
+def map_point_projection() -> Dict[str, Any]:
+    """$project stage shaping a report document into MapPoint fields."""
+    return {
+        "$project": {
+            "_id": 0,
+            "id": {"$toString": "$_id"},
+            "latitude": 1,
+            "longitude": 1,
+            "risk_level": RISK_LEVEL_EXPR,
+            "source": {"$literal": AssessmentSource.USER_REPORT.value},
+            "details": "$description",
+        }
+    }
+
+
+def stats_stages() -> List[Dict[str, Any]]:
+    """Exact total/high/medium counts over every input document."""
+    return [
+        {"$project": {"_id": 0, "water_level": 1}},
+        {
+            "$group": {
+                "_id": None,
+                "total_reports": {"$sum": 1},
+                "high_risk_count": {
+                    "$sum": {"$cond": [{"$in": ["$water_level", HIGH_WATER_LEVELS]}, 1, 0]}
+                },
+                "medium_risk_count": {
+                    "$sum": {"$cond": [{"$in": ["$water_level", MEDIUM_WATER_LEVELS]}, 1, 0]}
+                },
+            }
+        },
+        {"$project": {"_id": 0}},
+    ]
+
+
+def dashboard_pipeline(match: Dict[str, Any], max_points: int, include_stats: bool = True) -> List[Dict[str, Any]]:
+    """
+    Single round trip for the dashboard: exact high/medium/total counts over
+    every report matching `match`, plus the newest `max_points` map points
+    (one document with `stats` and `map_points`).
+
+    With include_stats=False (stats come from the materialized buckets) the
+    map points are returned directly as documents instead: outside $facet the
+    $match/$sort/$limit is served by the created_at index and reads only
+    `max_points` reports, where a facet sub-pipeline would scan the window.
+    """
+    # $sort + $limit is a bounded top-k sort, independent of window size
+    map_points = [{"$sort": {"created_at": -1}}, {"$limit": max_points}, map_point_projection()]
+    if not include_stats:
+        return [{"$match": match}, *map_points]
+    return [{"$match": match}, {"$facet": {"map_points": map_points, "stats": stats_stages()}}]
+
+
+def cluster_pipeline(match: Dict[str, Any], zoom: int, max_clusters: int) -> List[Dict[str, Any]]:
+    """
+    Like `dashboard_pipeline`, but reports are aggregated into a zoom-dependent
+    lat/lon grid. Each cluster carries its centroid, report count and highest
+    risk, and only the `max_clusters` densest cells are returned, so the payload
+    is bounded however many reports match.
+    """
+    cell = cluster_cell_degrees(zoom)
+    return [
+        {"$match": match},
+        {
+            "$facet": {
+                "stats": stats_stages(),
+                "clusters": [
+                    {"$project": {"_id": 0, "latitude": 1, "longitude": 1, "risk_rank": RISK_RANK_EXPR}},
+                    {
+                        "$group": {
+                            "_id": {
+                                "x": {"$floor": {"$divide": ["$longitude", cell]}},
+                                "y": {"$floor": {"$divide": ["$latitude", cell]}},
+                            },
+                            "latitude": {"$avg": "$latitude"},
+                            "longitude": {"$avg": "$longitude"},
+                            "count": {"$sum": 1},
+                            "max_rank": {"$max": "$risk_rank"},
+                        }
+                    },
+                    {"$sort": {"count": -1}},
+                    {"$limit": max_clusters},
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "latitude": 1,
+                            "longitude": 1,
+                            "count": 1,
+                            "risk_level": {
+                                "$arrayElemAt": [
+                                    [RiskLevel.LOW.value, RiskLevel.MEDIUM.value, RiskLevel.HIGH.value],
+                                    "$max_rank",
+                                ]
+                            },
+                        }
+                    },
+                ],
+            }
+        },
+    ]
+
+
+def empty_stats() -> Dict[str, int]:
+    return {"total_reports": 0, "high_risk_count": 0, "medium_risk_count": 0}
@@ -0,0 +1,213 @@
+"""
+Materialized rolling dashboard statistics.
+
+Report counts are kept in per-hour buckets, broken down by water level and
+risk level. Each new report increments its bucket in memory and in the
+`dashboard_stats` collection, and buckets older than the retention window
+roll off (in MongoDB through a TTL index). Stats for a range inside the
+window are a sum over at most `retention_hours` buckets, however many reports
+there are, plus an exact count of the partial hours at either end.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.schemas import RiskLevel
+from app.services.dashboard_service import classify_water_level
+from app.utils.database import db
+from config.settings import DASHBOARD_STATS_REFRESH_SECONDS, DASHBOARD_STATS_RETENTION_HOURS
+
+DASHBOARD_STATS_COLLECTION = "dashboard_stats"
+
+Counts = Dict[str, int]
+
+
+def _utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def hour_start(ts: datetime) -> datetime:
+    return _utc(ts).replace(minute=0, second=0, microsecond=0)
+
+
+def _flatten(counts: Dict[str, Any], prefix: str = "") -> Counts:
+    flat: Counts = {}
+    for key, value in counts.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = int(value)
+    return flat
+
+
+def report_increments(report: Dict[str, Any]) -> Counts:
+    """Counter increments contributed by one report document."""
+    water_level = report.get("water_level")
+    water_level = getattr(water_level, "value", water_level) or "unspecified"
+    return {
+        "total": 1,
+        f"water_level.{water_level}": 1,
+        f"risk.{classify_water_level(water_level).value}": 1,
+    }
+
+
+class DashboardStatsStore:
+    """Per-hour report counters, in memory and persisted to MongoDB."""
+
+    def __init__(
+        self,
+        database,
+        retention_hours: int = DASHBOARD_STATS_RETENTION_HOURS,
+        refresh_seconds: int = DASHBOARD_STATS_REFRESH_SECONDS,
+    ):
+        self.db = database
+        self.retention = timedelta(hours=retention_hours)
+        self.refresh_seconds = refresh_seconds
+        self._buckets: Dict[datetime, Counts] = {}
+        self._refreshed_at: Optional[float] = None
+
+    def _roll_off(self) -> None:
+        cutoff = hour_start(datetime.now(timezone.utc)) - self.retention
+        for hour in [h for h in self._buckets if h < cutoff]:
+            del self._buckets[hour]
+
+    async def record(self, report: Dict[str, Any]) -> None:
+        """Add a newly created report to its hourly bucket."""
+        hour = hour_start(report["created_at"])
+        increments = report_increments(report)
+        bucket = self._buckets.setdefault(hour, {})
+        for key, value in increments.items():
+            bucket[key] = bucket.get(key, 0) + value
+        self._roll_off()
+
+        try:
+            await self.db.get_collection(DASHBOARD_STATS_COLLECTION).update_one(
+                {"_id": hour},
+                {
+                    "$inc": {f"counts.{key}": value for key, value in increments.items()},
+                    "$setOnInsert": {"expires_at": hour + self.retention + timedelta(hours=1)},
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            print(f"⚠️ Failed to persist dashboard stats for {hour.isoformat()}: {e}")
+
+    async def refresh(self) -> None:
+        """Reload buckets from MongoDB, rebuilding them from `reports` if none exist yet."""
+        collection = self.db.get_collection(DASHBOARD_STATS_COLLECTION)
+        cutoff = hour_start(datetime.now(timezone.utc)) - self.retention
+        docs = await collection.find({"_id": {"$gte": cutoff}}).to_list(length=None)
+        if not docs and await collection.estimated_document_count() == 0:
+            docs = await self.rebuild(cutoff)
+        self._buckets = {hour_start(doc["_id"]): _flatten(doc.get("counts", {})) for doc in docs}
+        self._refreshed_at = time.monotonic()
+
+    async def rebuild(self, since: datetime) -> list:
+        """Backfill buckets from the reports collection (first run or after data loss)."""
+        pipeline = [
+            {"$match": {"created_at": {"$gte": since}}},
+            {"$project": {"_id": 0, "created_at": 1, "water_level": 1}},
+            {
+                "$group": {
+                    "_id": {
+                        "hour": {"$dateTrunc": {"date": "$created_at", "unit": "hour"}},
+                        "water_level": {"$ifNull": ["$water_level", "unspecified"]},
+                    },
+                    "count": {"$sum": 1},
+                }
+            },
+        ]
+        grouped = await self.db.get_collection("reports").aggregate(pipeline, allowDiskUse=True).to_list(length=None)
+
+        buckets: Dict[datetime, Counts] = {}
+        for row in grouped:
+            hour = hour_start(row["_id"]["hour"])
+            increments = report_increments({"water_level": row["_id"]["water_level"]})
+            bucket = buckets.setdefault(hour, {})
+            for key in increments:
+                bucket[key] = bucket.get(key, 0) + row["count"]
+
+        collection = self.db.get_collection(DASHBOARD_STATS_COLLECTION)
+        for hour, counts in buckets.items():
+            await collection.update_one(
+                {"_id": hour},
+                {
+                    "$set": {
+                        **{f"counts.{key}": value for key, value in counts.items()},
+                        "expires_at": hour + self.retention + timedelta(hours=1),
+                    }
+                },
+                upsert=True,
+            )
+        print(f"✅ Rebuilt {len(buckets)} hourly dashboard stat buckets from reports")
+        return await collection.find({"_id": {"$gte": since}}).to_list(length=None)
+
+    def covers(self, start: datetime) -> bool:
+        """Whether a range starting at `start` lies inside the retention window."""
+        return hour_start(start) >= hour_start(datetime.now(timezone.utc)) - self.retention
+
+    async def count_reports(self, ranges: List[Tuple[datetime, datetime, bool]]) -> Counts:
+        """Exact counts of reports with created_at in any (low, high, high_inclusive) range."""
+        match = [
+            {"created_at": {"$gte": low, ("$lte" if inclusive else "$lt"): high}} for low, high, inclusive in ranges
+        ]
+        pipeline = [
+            {"$match": {"$or": match}},
+            {"$group": {"_id": {"$ifNull": ["$water_level", "unspecified"]}, "count": {"$sum": 1}}},
+        ]
+        totals: Counts = {}
+        async for row in self.db.get_collection("reports").aggregate(pipeline):
+            for key in report_increments({"water_level": row["_id"]}):
+                totals[key] = totals.get(key, 0) + row["count"]
+        return totals
+
+    async def summarize(self, start: datetime, end: Optional[datetime] = None) -> Counts:
+        """
+        Report counts for created_at in [start, end], matching the dashboard's
+        map-point window exactly: hours wholly inside the range come from the
+        buckets, the partial hours at either end (at most two) from `reports`.
+        """
+        if self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.refresh_seconds:
+            await self.refresh()
+        self._roll_off()
+
+        start = _utc(start)
+        end = _utc(end or datetime.now(timezone.utc))
+        if end < start:
+            return {}
+        # Whole buckets: [first_full, last_hour); the bucket holding `end` is always partial.
+        first_full = start if start == hour_start(start) else hour_start(start) + timedelta(hours=1)
+        last_hour = hour_start(end)
+        if first_full > last_hour:
+            edges = [(start, end, True)]
+        else:
+            edges = [(last_hour, end, True)]
+            if start < first_full:
+                edges.append((start, first_full, False))
+
+        totals = await self.count_reports(edges)
+        for hour, counts in self._buckets.items():
+            if first_full <= hour < last_hour:
+                for key, value in counts.items():
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+
+def breakdown(totals: Counts) -> Dict[str, Any]:
+    """Split flat bucket counters into dashboard-friendly groups."""
+    by_water_level = {k.split(".", 1)[1]: v for k, v in totals.items() if k.startswith("water_level.")}
+    by_risk_level = {k.split(".", 1)[1]: v for k, v in totals.items() if k.startswith("risk.")}
+    return {
+        "total_reports": totals.get("total", 0),
+        "high_risk_count": by_risk_level.get(RiskLevel.HIGH.value, 0),
+        "medium_risk_count": by_risk_level.get(RiskLevel.MEDIUM.value, 0),
+        "by_water_level": by_water_level,
+        "by_risk_level": by_risk_level,
+    }
+
+
+# Global dashboard stats store
+dashboard_stats = DashboardStatsStore(db)
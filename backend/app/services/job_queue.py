@@ -0,0 +1,179 @@
+"""
+Durable background job queue on a MongoDB collection.
+
+API handlers only `enqueue()`; worker.py processes claim jobs with an atomic
+find-and-update that takes a lease, so several worker processes can share the
+queue and a job whose worker died is picked up again once its lease expires.
+Failed jobs are retried with exponential backoff up to JOB_MAX_ATTEMPTS, then
+kept with status "failed" for inspection. A dedup key (e.g. the report's alert
+area) makes a new job a no-op while an equal one is still waiting to run.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.utils.database import db
+from app.utils.metrics import Counter, Gauge, metrics
+from app.utils.tracing import inject_carrier
+from config.settings import (
+    JOB_DEPTH_INTERVAL_SECONDS,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_RETENTION_HOURS,
+    JOB_RETRY_BASE_SECONDS,
+)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+queue_depth = metrics.register(Gauge("rainsafe_job_queue_depth", "Jobs in the queue by kind and status", ["kind", "status"]))
+queue_oldest = metrics.register(
+    Gauge("rainsafe_job_queue_oldest_seconds", "Age of the oldest job waiting to run", ["kind"])
+)
+# Recorded by worker processes (worker.py --metrics-port).
+jobs_processed = metrics.register(
+    Counter("rainsafe_jobs_processed_total", "Jobs run by outcome (done, retry, failed)", ["kind", "outcome"])
+)
+
+
+class JobQueue:
+    """Enqueue, claim, complete and retry jobs stored in one collection."""
+
+    def __init__(
+        self,
+        collection_name: str = "jobs",
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+        retry_base_seconds: float = JOB_RETRY_BASE_SECONDS,
+    ):
+        self.collection_name = collection_name
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self._seen_kinds: Set[str] = set()
+
+    @property
+    def collection(self):
+        return db.get_collection(self.collection_name)
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any], dedup_key: Optional[str] = None) -> Optional[str]:
+        """Queue a job; returns its id, or None if an equal job is already waiting."""
+        now = datetime.now(timezone.utc)
+        job = {
+            "kind": kind,
+            "payload": payload,
+            "status": QUEUED,
+            "attempts": 0,
+            "run_at": now,
+            "created_at": now,
+            "trace": inject_carrier(),
+        }
+        if dedup_key is not None:
+            job["dedup_key"] = f"{kind}:{dedup_key}"
+        try:
+            result = await self.collection.insert_one(job)
+        except DuplicateKeyError:
+            return None
+        return str(result.inserted_id)
+
+    async def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the next due job (or one whose lease expired) to `worker_id`."""
+        now = datetime.now(timezone.utc)
+        return await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": QUEUED, "run_at": {"$lte": now}},
+                    {"status": RUNNING, "lease_expires_at": {"$lte": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "worker": worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+                "$unset": {"dedup_key": ""},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def complete(self, job: Dict[str, Any]) -> None:
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {"_id": job["_id"], "worker": job["worker"]},
+            {
+                "$set": {
+                    "status": DONE,
+                    "finished_at": now,
+                    "expires_at": now + timedelta(hours=JOB_RETENTION_HOURS),
+                },
+                "$unset": {"lease_expires_at": ""},
+            },
+        )
+
+    async def fail(self, job: Dict[str, Any], error: str) -> bool:
+        """Schedule a retry with backoff; returns False once attempts are exhausted."""
+        now = datetime.now(timezone.utc)
+        retry = job["attempts"] < self.max_attempts
+        update: Dict[str, Any] = {"last_error": error, "finished_at": now}
+        if retry:
+            delay = self.retry_base_seconds * 2 ** (job["attempts"] - 1)
+            update.update(status=QUEUED, run_at=now + timedelta(seconds=delay))
+        else:
+            update["status"] = FAILED
+        await self.collection.update_one(
+            {"_id": job["_id"], "worker": job["worker"]},
+            {"$set": update, "$unset": {"lease_expires_at": ""}},
+        )
+        return retry
+
+    async def depth(self) -> Dict[str, Dict[str, int]]:
+        """Job counts per kind and status (finished jobs excluded)."""
+        counts: Dict[str, Dict[str, int]] = {}
+        pipeline = [
+            {"$match": {"status": {"$in": [QUEUED, RUNNING, FAILED]}}},
+            {"$group": {"_id": {"kind": "$kind", "status": "$status"}, "count": {"$sum": 1}}},
+        ]
+        async for row in self.collection.aggregate(pipeline):
+            counts.setdefault(row["_id"]["kind"], {})[row["_id"]["status"]] = row["count"]
+        return counts
+
+    async def update_depth_metrics(self) -> None:
+        counts = await self.depth()
+        # Kinds seen before but now empty must drop back to zero.
+        self._seen_kinds.update(counts)
+        for kind in self._seen_kinds:
+            by_status = counts.get(kind, {})
+            for status in (QUEUED, RUNNING, FAILED):
+                queue_depth.set(by_status.get(status, 0), kind, status)
+            oldest = await self.collection.find_one(
+                {"kind": kind, "status": QUEUED}, sort=[("run_at", 1)], projection={"created_at": 1}
+            )
+            age = 0.0
+            if oldest:
+                created_at = oldest["created_at"]
+                if created_at.tzinfo is None:
+                    created_at = created_at.replace(tzinfo=timezone.utc)
+                age = (datetime.now(timezone.utc) - created_at).total_seconds()
+            queue_oldest.set(age, kind)
+
+    async def watch_depth(self, interval_seconds: float = JOB_DEPTH_INTERVAL_SECONDS) -> None:
+        """Refresh the queue-depth gauges until cancelled."""
+        while True:
+            try:
+                await self.update_depth_metrics()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Could not read job queue depth: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+# Global job queue
+job_queue = JobQueue()
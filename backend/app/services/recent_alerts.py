@@ -0,0 +1,77 @@
+"""
+Ring buffer of the most recent validated alerts.
+
+`/alerts/recent` is the hottest polling endpoint. The buffer is warmed from
+MongoDB once at startup and then kept current by listening on the alert bus,
+so requests are answered from pre-encoded JSON bytes with an ETag instead of
+re-querying and re-validating documents every time.
+"""
+
+import hashlib
+import logging
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+import orjson
+
+from app.models.schemas import Alert
+from config.settings import RECENT_ALERTS_BUFFER_SIZE
+
+AlertPayload = Dict[str, Any]
+
+logger = logging.getLogger("RainSafe")
+
+
+def validate_alert_docs(docs: List[Dict[str, Any]]) -> List[AlertPayload]:
+    """Validate raw alert documents, skipping (and logging) malformed ones."""
+    payloads = []
+    for doc in docs:
+        try:
+            # Convert MongoDB's _id to string for Pydantic model
+            doc["_id"] = str(doc["_id"])
+            payloads.append(Alert(**doc).model_dump(mode="json", by_alias=True))
+        except Exception as validation_e:
+            logger.warning(f"⚠️ Document failed Alert model validation and was skipped: {validation_e}, Data: {doc}")
+    return payloads
+
+
+class RecentAlertsCache:
+    """Newest-first buffer of alert payloads with memoized JSON encodings."""
+
+    def __init__(self, capacity: int = RECENT_ALERTS_BUFFER_SIZE):
+        self.capacity = capacity
+        self.is_warm = False
+        self._alerts: "deque[AlertPayload]" = deque(maxlen=capacity)
+        self._encoded: Dict[int, Tuple[bytes, str]] = {}
+
+    async def warm(self, collection) -> List[str]:
+        """Fill the buffer with the latest alerts from MongoDB; returns their ids."""
+        docs = await collection.find().sort("sent_at", -1).limit(self.capacity).to_list(length=self.capacity)
+        self._alerts = deque(validate_alert_docs(docs), maxlen=self.capacity)
+        self._encoded.clear()
+        self.is_warm = True
+        print(f"✅ Recent alerts buffer warmed with {len(self._alerts)} alerts")
+        return [alert["_id"] for alert in self._alerts if alert.get("_id")]
+
+    def add(self, alert: AlertPayload) -> None:
+        """Alert bus listener: prepend a newly inserted alert."""
+        self._alerts.appendleft(alert)
+        self._encoded.clear()
+
+    def can_serve(self, limit: int) -> bool:
+        return self.is_warm and 0 < limit <= self.capacity
+
+    def encoded(self, limit: int) -> Tuple[bytes, str]:
+        """Return (JSON body, ETag) for the newest `limit` alerts, encoding at most once per change."""
+        cached = self._encoded.get(limit)
+        if cached is None:
+            items = [self._alerts[i] for i in range(min(limit, len(self._alerts)))]
+            body = orjson.dumps(items)
+            # Content hash, so every worker hands out the same ETag for the same alerts.
+            etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+            cached = self._encoded[limit] = (body, etag)
+        return cached
+
+
+# Global recent-alerts buffer
+recent_alerts = RecentAlertsCache()
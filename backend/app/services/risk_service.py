@@ -2,42 +2,28 @@ import math
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from app.models.flood_predictor import FloodPredictor
 from app.models.schemas import AssessmentSource, PredictionResult, RiskLevel
 from app.utils.database import db
-from app.utils.flood_zones import FloodZoneChecker
-from config.settings import OPENWEATHER_API_KEY, RISK_THRESHOLDS
-
-# Initialize FloodZoneChecker once; it loads KML polygons lazily.
-flood_checker = FloodZoneChecker("data/bangalore_flood_zones.kml")
+from app.utils.feature_store import feature_store
+from app.utils.flood_zones import proximity_score
+from app.utils.metrics import timed
+from app.utils.weather_client import WeatherClient, weather_client
+from app.utils.zone_catalog import zone_catalog
+from config.settings import RISK_THRESHOLDS
 
 
 class RiskAssessmentService:
     """Handles the complete flood risk assessment logic."""
 
-    def __init__(self, database, predictor: Optional[FloodPredictor] = None):
+    def __init__(
+        self, database, predictor: Optional[FloodPredictor] = None, weather: Optional[WeatherClient] = None
+    ):
         self.db = database
         self.predictor = predictor
-        self.weather_api_key: str = OPENWEATHER_API_KEY or ""
-
-    async def fetch_weather_data(
-        self, lat: float, lon: float
-    ) -> Optional[Dict[str, Any]]:
-        if not self.weather_api_key:
-            print("⚠️ Missing OpenWeather API key.")
-            return None
-        url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={self.weather_api_key}&units=metric"
-        try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                res = await client.get(url)
-                res.raise_for_status()
-                return res.json()
-        except Exception as e:
-            print(f"⚠️ Weather fetch failed for ({lat},{lon}): {e}")
-            return None
+        self.weather = weather or weather_client
 
+    @timed("reports.recent_count")
     async def get_recent_reports_count(self, lat: float, lon: float) -> int:
         collection = self.db.get_collection("reports")
         n_hours_ago = datetime.now(timezone.utc) - timedelta(hours=24)
@@ -59,45 +45,49 @@ class RiskAssessmentService:
             print(f"⚠️ Error counting reports: {e}")
             return 0
 
+    @timed("risk.gather_features")
     async def gather_features_for_prediction(
         self, lat: float, lon: float
     ) -> Dict[str, Any]:
         features: Dict[str, Any] = {}
-        weather_data_found = False
-        weather = await self.fetch_weather_data(lat, lon)
-
-        # Fill weather features
-        if weather and "main" in weather:
-            weather_data_found = True
-            temp = weather["main"].get("temp", 25)
-            hum = weather["main"].get("humidity", 60)
-            rainfall = weather.get("rain", {}).get("1h", 0)
-        else:
-            temp, hum, rainfall = 25, 60, 0
+        reading = await self.weather.get(lat, lon)
+        # Zones of the point's city, loaded on first use
+        zone_km = zone_catalog.distance_many([lat], [lon])
+
+        # Weather features only from a real (possibly stale) reading; without
+        # one they are left out and the ML prediction is skipped.
+        if reading is not None:
+            main = reading.data["main"]
+            features.update(
+                {
+                    "Temperature": main["temp"],
+                    "Humidity": main["humidity"],
+                    # OpenWeather omits "rain" when it isn't raining
+                    "Rainfall_Intensity": reading.data.get("rain", {}).get("1h", 0),
+                }
+            )
 
         features.update(
             {
-                "Temperature": temp,
-                "Humidity": hum,
-                "Rainfall_Intensity": rainfall,
                 "Latitude": lat,
                 "Longitude": lon,
-                "Altitude": 900,
-                "River_Level": 5.0,
-                "flood_proximity_score": 0,
+                "flood_proximity_score": float(proximity_score(zone_km)[0]),
+                # Altitude, River_Level from the raster grid
+                **feature_store.sample(lat, lon),
             }
         )
+        # rainfall_anomaly / is_monsoon are derived by the predictor's FeatureTransform
 
-        # Feature engineering consistent with model training
-        features["rainfall_anomaly"] = (
-            features["Rainfall_Intensity"] - 50
-        )  # placeholder mean
-        features["is_monsoon"] = 1 if 11 <= lat <= 19 else 0
+        # Distance 0 means inside a zone polygon
+        features["in_flood_zone"] = int(zone_km[0] == 0.0)
 
-        # Lazy evaluation: check if point is in flood zone only when needed
-        features["in_flood_zone"] = int(flood_checker.is_in_flood_zone(lat, lon))
+        return {
+            "features": features,
+            "weather_data_found": reading is not None,
+            "weather_stale": reading is not None and reading.stale,
+            "weather_age_seconds": round(reading.age_seconds, 1) if reading is not None else None,
+        }
 
-        return {"features": features, "weather_data_found": weather_data_found}
     def demo_override_risk(self, lat: float, lon: float) -> Optional[RiskLevel]:
         """Demo override for key points."""
         # Majestic → High
@@ -130,6 +120,7 @@ class RiskAssessmentService:
         # 3. Threshold-based fallback
         return threshold_risk
 
+    @timed("risk.assess")
     async def get_risk_prediction(
         self, lat: float, lon: float, predictor: Optional[FloodPredictor] = None
     ) -> PredictionResult:
@@ -149,6 +140,12 @@ class RiskAssessmentService:
 
         features_data = await self.gather_features_for_prediction(lat, lon)
         weather_found = features_data["weather_data_found"]
+        weather_stale = features_data["weather_stale"]
+        if not weather_found:
+            contributing_factors.append("Weather data unavailable; ML prediction skipped.")
+        elif weather_stale:
+            minutes = features_data["weather_age_seconds"] / 60
+            contributing_factors.append(f"Weather data is stale ({minutes:.0f} min old).")
 
         # ML-based prediction (if predictor is ready and weather data available)
         if predictor and predictor.is_ready and weather_found:
@@ -188,6 +185,8 @@ class RiskAssessmentService:
             ml_assessment=ml_assessment,
             user_reports_found=user_reports,
             weather_data_found=weather_found,
+            weather_stale=weather_stale,
+            weather_age_seconds=features_data["weather_age_seconds"],
             contributing_factors=contributing_factors,
             recommendation=recommendations.get(
                 final_risk, "Could not determine recommendation."
@@ -0,0 +1,172 @@
+"""
+Mapbox Vector Tiles for recent reports and flood zones.
+
+Each tile holds two layers, `reports` (recent reports with their risk level)
+and `flood_zones`, encoded in Web Mercator. Encoded tiles are kept in an LRU
+cache; a new report drops the cached tile containing it at every zoom level.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import mapbox_vector_tile
+import numpy as np
+import shapely
+from shapely.geometry import Point
+
+from app.services.dashboard_service import RISK_LEVEL_EXPR
+from app.utils.zone_catalog import FloodZoneCatalog
+from config.settings import (
+    DASHBOARD_WINDOW_HOURS,
+    TILE_CACHE_MAX_ENTRIES,
+    TILE_CACHE_TTL_SECONDS,
+    TILE_EXTENT,
+    TILE_MAX_REPORTS,
+    TILE_MAX_ZOOM,
+)
+
+_EARTH_HALF_CIRCUMFERENCE = 20037508.342789244  # metres, Web Mercator
+_MAX_MERCATOR_LAT = 85.0511287798
+
+TileKey = Tuple[int, int, int]
+
+
+def tile_lonlat_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of an XYZ tile."""
+    n = 2 ** z
+
+    def lat(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+
+def tile_mercator_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    size = 2 * _EARTH_HALF_CIRCUMFERENCE / 2 ** z
+    min_x = -_EARTH_HALF_CIRCUMFERENCE + x * size
+    max_y = _EARTH_HALF_CIRCUMFERENCE - y * size
+    return min_x, max_y - size, min_x + size, max_y
+
+
+def tile_for_point(lat: float, lon: float, z: int) -> TileKey:
+    n = 2 ** z
+    lat = max(min(lat, _MAX_MERCATOR_LAT), -_MAX_MERCATOR_LAT)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return z, min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def _to_mercator(coords: np.ndarray) -> np.ndarray:
+    lon, lat = coords[:, 0], np.clip(coords[:, 1], -_MAX_MERCATOR_LAT, _MAX_MERCATOR_LAT)
+    x = lon * _EARTH_HALF_CIRCUMFERENCE / 180.0
+    y = np.log(np.tan(np.radians(90.0 + lat) / 2.0)) * _EARTH_HALF_CIRCUMFERENCE / math.pi
+    return np.column_stack([x, y])
+
+
+class TileCache:
+    """LRU cache of encoded tiles with a TTL, invalidated per point."""
+
+    def __init__(self, max_entries: int = TILE_CACHE_MAX_ENTRIES, ttl_seconds: int = TILE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._tiles: "OrderedDict[TileKey, Tuple[float, bytes]]" = OrderedDict()
+
+    def get(self, key: TileKey):
+        entry = self._tiles.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._tiles[key]
+            return None
+        self._tiles.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: TileKey, tile: bytes) -> None:
+        self._tiles[key] = (time.monotonic() + self.ttl_seconds, tile)
+        self._tiles.move_to_end(key)
+        while len(self._tiles) > self.max_entries:
+            self._tiles.popitem(last=False)
+
+    def invalidate_point(self, lat: float, lon: float) -> None:
+        """Drop the tile containing (lat, lon) at every zoom level."""
+        for z in range(TILE_MAX_ZOOM + 1):
+            self._tiles.pop(tile_for_point(lat, lon, z), None)
+
+
+class VectorTileService:
+    """Builds and caches MVT tiles from the reports collection and flood zone index."""
+
+    def __init__(self, database, zone_checker: FloodZoneCatalog):
+        self.db = database
+        self.zone_checker = zone_checker
+        self.cache = TileCache()
+
+    async def _report_features(self, bounds: Tuple[float, float, float, float]) -> List[Dict[str, Any]]:
+        min_lon, min_lat, max_lon, max_lat = bounds
+        pipeline = [
+            {
+                "$match": {
+                    "created_at": {"$gte": datetime.now(timezone.utc) - timedelta(hours=DASHBOARD_WINDOW_HOURS)},
+                    "latitude": {"$gte": min_lat, "$lte": max_lat},
+                    "longitude": {"$gte": min_lon, "$lte": max_lon},
+                }
+            },
+            {"$sort": {"created_at": -1}},
+            {"$limit": TILE_MAX_REPORTS},
+            {
+                "$project": {
+                    "_id": 0,
+                    "id": {"$toString": "$_id"},
+                    "latitude": 1,
+                    "longitude": 1,
+                    "water_level": 1,
+                    "risk_level": RISK_LEVEL_EXPR,
+                }
+            },
+        ]
+        docs = await self.db.get_collection("reports").aggregate(pipeline).to_list(length=TILE_MAX_REPORTS)
+        if not docs:
+            return []
+
+        coords = _to_mercator(np.array([[d["longitude"], d["latitude"]] for d in docs], dtype=float))
+        return [
+            {
+                "geometry": Point(x, y),
+                "properties": {
+                    "id": d["id"],
+                    "risk_level": d["risk_level"],
+                    "water_level": d.get("water_level") or "",
+                },
+            }
+            for d, (x, y) in zip(docs, coords)
+        ]
+
+    def _zone_features(self, bounds: Tuple[float, float, float, float]) -> List[Dict[str, Any]]:
+        return [
+            {"geometry": shapely.transform(geom, _to_mercator), "properties": {"name": name}}
+            for name, geom in self.zone_checker.zones_in_bbox(*bounds)
+        ]
+
+    async def get_tile(self, z: int, x: int, y: int) -> bytes:
+        key = (z, x, y)
+        tile = self.cache.get(key)
+        if tile is not None:
+            return tile
+
+        bounds = tile_lonlat_bounds(z, x, y)
+        layers = [
+            {"name": "reports", "features": await self._report_features(bounds)},
+            {"name": "flood_zones", "features": self._zone_features(bounds)},
+        ]
+        tile = mapbox_vector_tile.encode(
+            layers,
+            default_options={"quantize_bounds": tile_mercator_bounds(z, x, y), "extents": TILE_EXTENT},
+        )
+        self.cache.put(key, tile)
+        return tile
+
+    def invalidate_report(self, lat: float, lon: float) -> None:
+        self.cache.invalidate_point(lat, lon)
@@ -1,6 +1,7 @@
 from typing import Optional
 import motor.motor_asyncio
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from app.utils.metrics import MongoCommandMetrics, metrics
 from config.settings import MONGO_URI, DATABASE_NAME
 
 
@@ -13,7 +14,8 @@ class Database:
     
     async def connect(self) -> bool:
         try:
-            self.client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
+            listeners = [MongoCommandMetrics()] if metrics.enabled else []
+            self.client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI, event_listeners=listeners)
             self.database = self.client[DATABASE_NAME]
             
             # Test connection
@@ -40,6 +42,31 @@ class Database:
             raise RuntimeError("Database not connected")
         return self.database[collection_name]  # ✅ This is a collection
 
+    async def ensure_indexes(self) -> None:
+        """Create the indexes the API relies on (idempotent)."""
+        if self.database is None:
+            raise RuntimeError("Database not connected")
+        # Expire cached geocode names once their expires_at passes.
+        await self.database["geocode_cache"].create_index("expires_at", expireAfterSeconds=0)
+        # Dashboard window scans: the $match and the stats group stay on the index.
+        await self.database["reports"].create_index([("created_at", -1), ("water_level", 1)])
+        # Keyset pagination and exports: newest first with _id as tie-breaker.
+        await self.database["reports"].create_index([("created_at", -1), ("_id", -1)])
+        await self.database["alerts"].create_index([("sent_at", -1), ("_id", -1)])
+        # Roll hourly dashboard stat buckets off after the retention window.
+        await self.database["dashboard_stats"].create_index("expires_at", expireAfterSeconds=0)
+        # Job queue (app/services/job_queue.py): due-job and expired-lease claims,
+        # dedup keys held only while a job waits, finished jobs rolled off by TTL.
+        await self.database["jobs"].create_index([("status", 1), ("run_at", 1)])
+        await self.database["jobs"].create_index([("status", 1), ("lease_expires_at", 1)])
+        await self.database["jobs"].create_index(
+            "dedup_key", unique=True, partialFilterExpression={"dedup_key": {"$exists": True}}
+        )
+        await self.database["jobs"].create_index("expires_at", expireAfterSeconds=0)
+        # Alert area claims (app/services/alert_aggregator.py) are removed once their window ends.
+        await self.database["alert_areas"].create_index("expires_at", expireAfterSeconds=0)
+        print("✅ MongoDB indexes ensured")
+
 
 # Global database instance
 db = Database()
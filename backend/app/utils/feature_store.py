@@ -0,0 +1,89 @@
+"""
+Raster-backed location features (Altitude, River_Level) for the ML model.
+
+`build_feature_grid.py` resamples elevation / river-level rasters onto
+one lat/lon grid and stacks them into a single (rows, cols, layers) array,
+so every cell holds its precomputed feature vector. The store memory-maps
+that array: sampling a point is one index computation and one row read, and
+only the pages actually touched are loaded. Points outside the grid, cells
+without data, or a missing grid fall back to the configured constants.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.utils.metrics import timed
+from config.settings import FEATURE_STORE_DEFAULTS, FEATURE_STORE_PATH
+
+
+class FeatureStore:
+    """Vectorized point sampling of a memory-mapped multi-layer feature grid."""
+
+    def __init__(self, grid_path: str = FEATURE_STORE_PATH, defaults: Optional[Dict[str, float]] = None):
+        self.grid_path = Path(grid_path)
+        self.meta_path = self.grid_path.with_suffix(".json")
+        self.defaults: Dict[str, float] = dict(FEATURE_STORE_DEFAULTS if defaults is None else defaults)
+        self.layers: List[str] = []
+        self._grid: Optional[np.ndarray] = None
+        self._loaded = False
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.grid_path.exists() or not self.meta_path.exists():
+            print(f"⚠️ Feature grid not found at {self.grid_path}; using default location features")
+            return
+        meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        self._grid = np.load(self.grid_path, mmap_mode="r")
+        self.layers = list(meta["layers"])
+        self._origin_lon = float(meta["origin_lon"])  # west edge
+        self._origin_lat = float(meta["origin_lat"])  # north edge
+        self._cell = float(meta["cell_size_deg"])
+        print(f"✅ Feature grid loaded: {self._grid.shape[0]}x{self._grid.shape[1]} cells, layers {self.layers}")
+
+    @property
+    def feature_names(self) -> List[str]:
+        if not self._loaded:
+            self._load()
+        return self.layers + [name for name in self.defaults if name not in self.layers]
+
+    @timed("feature_store.sample")
+    def sample_many(self, lats: np.ndarray, lons: np.ndarray) -> Dict[str, np.ndarray]:
+        """Feature columns for every (lat, lon), keyed by layer name."""
+        if not self._loaded:
+            self._load()
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        n = lats.shape[0]
+
+        columns: Dict[str, np.ndarray] = {
+            name: np.full(n, self.defaults.get(name, np.nan), dtype=float) for name in self.feature_names
+        }
+        if self._grid is None or n == 0:
+            return columns
+
+        rows = np.floor((self._origin_lat - lats) / self._cell).astype(np.int64)
+        cols = np.floor((lons - self._origin_lon) / self._cell).astype(np.int64)
+        inside = (rows >= 0) & (rows < self._grid.shape[0]) & (cols >= 0) & (cols < self._grid.shape[1])
+        if not inside.any():
+            return columns
+
+        # Fancy indexing on the memmap reads only the touched cells.
+        vectors = np.asarray(self._grid[rows[inside], cols[inside]], dtype=float)
+        for i, name in enumerate(self.layers):
+            values = vectors[:, i]
+            column = columns[name]
+            sampled = np.where(np.isnan(values), column[inside], values)
+            column[inside] = sampled
+        return columns
+
+    def sample(self, lat: float, lon: float) -> Dict[str, float]:
+        """Feature dict for one point, ready to merge into the prediction features."""
+        columns = self.sample_many(np.array([lat]), np.array([lon]))
+        return {name: float(values[0]) for name, values in columns.items()}
+
+
+# Global feature store
+feature_store = FeatureStore()
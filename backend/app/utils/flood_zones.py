@@ -1,11 +1,29 @@
+import math
 from pathlib import Path
-from typing import Generator, Union
+from typing import Generator, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
+import shapely
 from fastkml import kml
-from shapely.geometry import MultiPolygon, Point, Polygon
+from shapely.geometry import MultiPolygon, Point, Polygon, box, shape
+from shapely.geometry.base import BaseGeometry
+from shapely.strtree import STRtree
+
+from app.utils.metrics import timed
+from config.settings import FLOOD_PROXIMITY_SCALE_KM
 
 FeatureType = Union[kml.Document, kml.Folder, kml.Placemark]
 
+# Kilometres per degree for the local equirectangular projection used by
+# the distance index (same approach as the offline geocoder).
+_KM_PER_DEG_LAT = 110.574
+_KM_PER_DEG_LON_EQUATOR = 111.320
+
+
+def proximity_score(distance_km: np.ndarray) -> np.ndarray:
+    """`flood_proximity_score`: 1 at a flood zone, decaying exponentially with distance."""
+    return np.exp(-np.asarray(distance_km, dtype=float) / FLOOD_PROXIMITY_SCALE_KM)
+
 
 class FloodZoneChecker:
     """Checks if a given lat/lon is inside any flood zone defined in a KML file."""
@@ -13,6 +31,12 @@ class FloodZoneChecker:
     def __init__(self, kml_path: str):
         self.kml_path = Path(kml_path)
         self.polygons: list[Polygon] = []
+        # Every named zone feature (points and polygons), indexed for bbox queries
+        self.zones: List[Tuple[str, BaseGeometry]] = []
+        self._zone_tree: Optional[STRtree] = None
+        # Same zones projected to km, for nearest-zone distance queries
+        self._distance_tree: Optional[STRtree] = None
+        self._lon_scale = _KM_PER_DEG_LON_EQUATOR
         self.load_kml()
 
     def load_kml(self):
@@ -27,6 +51,10 @@ class FloodZoneChecker:
         for feat in self._iter_features(k_obj.features()):
             geom = getattr(feat, "geometry", None)
             if geom:
+                # fastkml hands back pygeoif geometries when it can't use Shapely (Shapely 2)
+                geom = shapely.force_2d(shape(geom.__geo_interface__))
+                if isinstance(geom, (Point, Polygon, MultiPolygon)):
+                    self.zones.append(((getattr(feat, "name", None) or "").strip(), geom))
                 if isinstance(geom, Polygon):
                     self.polygons.append(geom)
                 elif isinstance(geom, MultiPolygon):
@@ -34,6 +62,19 @@ class FloodZoneChecker:
                         poly for poly in geom.geoms if isinstance(poly, Polygon)
                     )
 
+        if not self.zones:
+            raise ValueError(f"No point or polygon flood zones in {self.kml_path}")
+
+        self._zone_tree = STRtree([geom for _, geom in self.zones])
+        mean_lat = float(np.mean([geom.centroid.y for _, geom in self.zones]))
+        self._lon_scale = _KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(mean_lat))
+        self._distance_tree = STRtree(
+            [shapely.transform(geom, self._project) for _, geom in self.zones]
+        )
+
+    def _project(self, coords: np.ndarray) -> np.ndarray:
+        return coords * np.array([self._lon_scale, _KM_PER_DEG_LAT])
+
     def _iter_features(
         self, features: Generator[FeatureType, None, None]
     ) -> Generator[FeatureType, None, None]:
@@ -43,7 +84,39 @@ class FloodZoneChecker:
             if isinstance(feat, (kml.Document, kml.Folder)):
                 yield from self._iter_features(feat.features())  # generator recursion
 
+    @timed("flood_zones.contains")
     def is_in_flood_zone(self, lat: float, lon: float) -> bool:
         """Check if a point is inside any flood zone polygon."""
         point = Point(lon, lat)
         return any(poly.contains(point) for poly in self.polygons)
+
+    def zones_in_bbox(
+        self, min_lon: float, min_lat: float, max_lon: float, max_lat: float
+    ) -> List[Tuple[str, BaseGeometry]]:
+        """Return (name, geometry) for every zone feature intersecting a lon/lat box."""
+        if self._zone_tree is None:
+            return []
+        hits = self._zone_tree.query(box(min_lon, min_lat, max_lon, max_lat), predicate="intersects")
+        return [self.zones[i] for i in sorted(hits)]
+
+    @timed("flood_zones.distance")
+    def distance_many(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        """
+        Distance in km from each point to the nearest flood zone (0 inside a
+        zone polygon); inf when no zones are loaded. One vectorized STRtree query.
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        distances = np.full(lats.shape[0], np.inf)
+        if self._distance_tree is None or lats.shape[0] == 0:
+            return distances
+
+        points = shapely.points(lons * self._lon_scale, lats * _KM_PER_DEG_LAT)
+        (input_idx, _), nearest = self._distance_tree.query_nearest(
+            points, return_distance=True, all_matches=False
+        )
+        distances[input_idx] = nearest
+        return distances
+
+    def proximity_many(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        return proximity_score(self.distance_many(lats, lons))
@@ -0,0 +1,130 @@
+"""
+Two-tier cache for reverse geocoding results.
+
+Lookups are keyed on a rounded coordinate cell. An in-memory LRU serves hot
+cells, a MongoDB collection with a TTL index keeps names across restarts, and
+concurrent misses for the same cell share a single upstream call.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from config.settings import (
+    GEOCODE_CACHE_MAX_ENTRIES,
+    GEOCODE_CACHE_PRECISION,
+    GEOCODE_CACHE_TTL_DAYS,
+)
+
+GEOCODE_CACHE_COLLECTION = "geocode_cache"
+
+Fetcher = Callable[[float, float], Awaitable[Optional[str]]]
+
+
+def cell_key(lat: float, lon: float, precision: int = GEOCODE_CACHE_PRECISION) -> Tuple[float, float]:
+    """Snap a coordinate to the centre of its cache cell."""
+    return round(lat, precision), round(lon, precision)
+
+
+class RateLimiter:
+    """Spaces calls at least `min_interval` seconds apart across all callers."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._last_call = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            delay = self._last_call + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last_call = time.monotonic()
+
+
+class GeocodeCache:
+    """In-memory LRU backed by a persistent MongoDB tier with long TTLs."""
+
+    def __init__(
+        self,
+        database,
+        precision: int = GEOCODE_CACHE_PRECISION,
+        max_entries: int = GEOCODE_CACHE_MAX_ENTRIES,
+        ttl_days: int = GEOCODE_CACHE_TTL_DAYS,
+    ):
+        self.db = database
+        self.precision = precision
+        self.max_entries = max_entries
+        self.ttl = timedelta(days=ttl_days)
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[Optional[str]]"] = {}
+
+    def _key(self, lat: float, lon: float) -> str:
+        return f"{lat:.{self.precision}f},{lon:.{self.precision}f}"
+
+    def _remember(self, key: str, name: str) -> None:
+        self._memory[key] = name
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _load_persistent(self, key: str) -> Optional[str]:
+        if self.db.database is None:
+            return None
+        try:
+            doc = await self.db.get_collection(GEOCODE_CACHE_COLLECTION).find_one(
+                {"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+                {"name": 1},
+            )
+        except Exception as e:
+            print(f"⚠️ Geocode cache read failed for {key}: {e}")
+            return None
+        return doc["name"] if doc else None
+
+    async def _store_persistent(self, key: str, name: str) -> None:
+        if self.db.database is None:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            await self.db.get_collection(GEOCODE_CACHE_COLLECTION).update_one(
+                {"_id": key},
+                {"$set": {"name": name, "cached_at": now, "expires_at": now + self.ttl}},
+                upsert=True,
+            )
+        except Exception as e:
+            print(f"⚠️ Geocode cache write failed for {key}: {e}")
+
+    async def _resolve(self, key: str, lat: float, lon: float, fetch: Fetcher) -> Optional[str]:
+        try:
+            name = await self._load_persistent(key)
+            if name is None:
+                name = await fetch(lat, lon)
+                if name is not None:
+                    await self._store_persistent(key, name)
+            if name is not None:
+                self._remember(key, name)
+            return name
+        finally:
+            self._inflight.pop(key, None)
+
+    async def get_or_fetch(self, lat: float, lon: float, fetch: Fetcher) -> Optional[str]:
+        """
+        Return the cached name for the cell containing (lat, lon), calling
+        `fetch` with the cell centre on a miss. Failed lookups (None) are not cached.
+        """
+        cell_lat, cell_lon = cell_key(lat, lon, self.precision)
+        key = self._key(cell_lat, cell_lon)
+
+        name = self._memory.get(key)
+        if name is not None:
+            self._memory.move_to_end(key)
+            return name
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._resolve(key, cell_lat, cell_lon, fetch))
+            self._inflight[key] = task
+        # Shield so one cancelled caller doesn't cancel the lookup for everyone else.
+        return await asyncio.shield(task)
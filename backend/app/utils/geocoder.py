@@ -2,12 +2,47 @@
 import httpx
 from typing import Optional
 
-NOMINATIM_URL = "https://nominatim.openstreetmap.org/reverse"
+from app.utils.database import db
+from app.utils.geocode_cache import GeocodeCache, RateLimiter
+from app.utils.metrics import timed
+from app.utils.offline_geocoder import OfflineGeocoder
+from app.utils.resilience import CircuitBreaker, CircuitOpenError
+from config.settings import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    GEOCODER_GAZETTEER_PATH,
+    GEOCODER_MAX_DISTANCE_KM,
+    GEOCODER_NOMINATIM_FALLBACK,
+    NOMINATIM_MIN_INTERVAL_SECONDS,
+    NOMINATIM_URL,
+)
 
-async def reverse_geocode(latitude: float, longitude: float) -> Optional[str]:
+# Shared across all requests in this process: repeated lookups for the same
+# neighbourhood hit the cache, and misses are spaced to respect Nominatim's policy.
+geocode_cache = GeocodeCache(db)
+nominatim_limiter = RateLimiter(NOMINATIM_MIN_INTERVAL_SECONDS)
+# While Nominatim keeps failing, skip it (and the rate-limit wait) and use the fallback label.
+nominatim_breaker = CircuitBreaker("nominatim", CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+
+# Local gazetteer lookup; Nominatim is only consulted when it has no match.
+try:
+    offline_geocoder: Optional[OfflineGeocoder] = OfflineGeocoder(
+        GEOCODER_GAZETTEER_PATH, max_distance_km=GEOCODER_MAX_DISTANCE_KM
+    )
+except Exception as e:
+    print(f"⚠️ Offline geocoder unavailable, using Nominatim only: {e}")
+    offline_geocoder = None
+
+
+def _coordinate_label(latitude: float, longitude: float) -> str:
+    return f"Lat: {latitude:.4f}, Lon: {longitude:.4f}"
+
+
+@timed("geocode.nominatim")
+async def fetch_nominatim_name(latitude: float, longitude: float) -> Optional[str]:
     """
-    Performs reverse geocoding to get a human-readable location name
-    from latitude and longitude using OpenStreetMap Nominatim.
+    Queries OpenStreetMap Nominatim for a human-readable location name.
+    Returns None if the lookup fails so the caller can decide on a fallback.
     """
     params = {
         "lat": latitude,
@@ -20,31 +55,51 @@ async def reverse_geocode(latitude: float, longitude: float) -> Optional[str]:
         "User-Agent": "RainSafeApp/1.0 (your_email@example.com)" # Nominatim requires a User-Agent
     }
 
-    try:
+    async def request():
+        await nominatim_limiter.wait()
         async with httpx.AsyncClient() as client:
             response = await client.get(NOMINATIM_URL, params=params, headers=headers, timeout=5)
             response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-            data = response.json()
-
-            if data and "display_name" in data:
-                # You might want to process display_name to get a shorter, more relevant name
-                # For example, splitting by comma and taking the first few parts.
-                full_name = data["display_name"]
-                # Example: "123 Main St, Anytown, State, Country" -> "Anytown" or "123 Main St, Anytown"
-                parts = full_name.split(', ')
-                if len(parts) >= 2:
-                    return f"{parts[0]}, {parts[1]}" # e.g., "Koramangala, Bengaluru"
-                return full_name
-            
-            # Fallback if display_name is not found or data is empty
-            return f"Lat: {latitude:.4f}, Lon: {longitude:.4f}"
+            return response.json()
+
+    try:
+        data = await nominatim_breaker.call(request)
+
+        if data and "display_name" in data:
+            # You might want to process display_name to get a shorter, more relevant name
+            # For example, splitting by comma and taking the first few parts.
+            full_name = data["display_name"]
+            # Example: "123 Main St, Anytown, State, Country" -> "Anytown" or "123 Main St, Anytown"
+            parts = full_name.split(', ')
+            if len(parts) >= 2:
+                return f"{parts[0]}, {parts[1]}" # e.g., "Koramangala, Bengaluru"
+            return full_name
+
+        return None
 
+    except CircuitOpenError:
+        return None
     except httpx.RequestError as exc:
         print(f"HTTPX request error during reverse geocoding for {latitude},{longitude}: {exc}")
-        return f"Lat: {latitude:.4f}, Lon: {longitude:.4f}"
+        return None
     except httpx.HTTPStatusError as exc:
         print(f"HTTP status error during reverse geocoding for {latitude},{longitude}: {exc.response.status_code} - {exc.response.text}")
-        return f"Lat: {latitude:.4f}, Lon: {longitude:.4f}"
+        return None
     except Exception as exc:
         print(f"An unexpected error occurred during reverse geocoding for {latitude},{longitude}: {exc}")
-        return f"Lat: {latitude:.4f}, Lon: {longitude:.4f}"
\ No newline at end of file
+        return None
+
+
+@timed("geocode.reverse")
+async def reverse_geocode(latitude: float, longitude: float) -> Optional[str]:
+    """
+    Performs reverse geocoding to get a human-readable location name
+    from latitude and longitude. The bundled gazetteer is tried first; if it
+    has no locality nearby, OpenStreetMap Nominatim is queried through the
+    geocode cache (unless GEOCODER_NOMINATIM_FALLBACK is disabled).
+    """
+    name = offline_geocoder.lookup(latitude, longitude) if offline_geocoder else None
+    if name is None and GEOCODER_NOMINATIM_FALLBACK:
+        name = await geocode_cache.get_or_fetch(latitude, longitude, fetch_nominatim_name)
+    # Fallback if the lookup failed or returned no display_name
+    return name or _coordinate_label(latitude, longitude)
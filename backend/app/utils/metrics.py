@@ -0,0 +1,225 @@
+"""
+In-process latency histograms and counters, exposed in Prometheus text format.
+
+`timed("stage")` wraps a function (sync or async) or a block and records its
+duration under that stage name (and opens a span of the same name when
+tracing is on, see app/utils/tracing.py); MongoDB commands are timed through
+a pymongo command listener, and HTTP requests by middleware in main.py. With
+metrics and tracing both disabled the decorator returns the function
+untouched and the context manager is a no-op, so disabled instrumentation
+costs nothing on the hot paths.
+"""
+
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from pymongo import monitoring
+
+from app.utils.tracing import stage_span
+from config.settings import METRICS_ENABLED, TRACING_ENABLED
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[str, ...]
+
+
+def _label_str(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_label_str(self.label_names, labels)} {value}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_label_str(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and three increments."""
+
+    def __init__(
+        self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series.setdefault(labels, [0.0] * (len(self.buckets) + 2))
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                le = _label_str(self.label_names, labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_str = _label_str(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_str} {series[-1]}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """All metrics the API exposes on /metrics."""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.stage_seconds = Histogram(
+            "rainsafe_stage_duration_seconds", "Duration of instrumented processing stages", ["stage"]
+        )
+        self.stage_errors = Counter("rainsafe_stage_errors_total", "Exceptions raised by instrumented stages", ["stage"])
+        self.http_seconds = Histogram(
+            "rainsafe_http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+        )
+        self.mongo_seconds = Histogram(
+            "rainsafe_mongo_command_duration_seconds", "MongoDB command latency", ["command", "collection"]
+        )
+        self.mongo_failures = Counter(
+            "rainsafe_mongo_command_failures_total", "Failed MongoDB commands", ["command", "collection"]
+        )
+        self._collectors = [self.stage_seconds, self.stage_errors, self.http_seconds, self.mongo_seconds, self.mongo_failures]
+
+    def register(self, metric):
+        """Add another Counter/Gauge/Histogram (or anything with render()) to /metrics."""
+        self._collectors.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for collector in self._collectors:
+            lines.extend(collector.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
+
+
+@contextmanager
+def _timed_block(stage: str):
+    with stage_span(stage):
+        if not metrics.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            metrics.stage_errors.inc(stage)
+            raise
+        finally:
+            metrics.stage_seconds.observe(time.perf_counter() - start, stage)
+
+
+def _instrumented() -> bool:
+    return metrics.enabled or TRACING_ENABLED
+
+
+def timed(stage: str):
+    """
+    Record the duration of a stage. Works as a decorator for sync and async
+    functions and as a context manager: `with timed("model.predict"): ...`.
+    """
+    return _Timed(stage)
+
+
+class _Timed:
+    __slots__ = ("stage", "_ctx")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __call__(self, fn: Callable) -> Callable:
+        if not _instrumented():
+            return fn
+        stage = self.stage
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with _timed_block(stage):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _timed_block(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self):
+        self._ctx = _timed_block(self.stage) if _instrumented() else nullcontext()
+        return self._ctx.__enter__()
+
+    def __exit__(self, *exc):
+        return self._ctx.__exit__(*exc)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Times every command the driver sends, keyed by command and collection."""
+
+    def __init__(self):
+        self._pending: Dict[int, Tuple[str, str]] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        self._pending[event.request_id] = (
+            event.command_name,
+            collection if isinstance(collection, str) else "",
+        )
+
+    def succeeded(self, event):
+        labels = self._pending.pop(event.request_id, (event.command_name, ""))
+        metrics.mongo_seconds.observe(event.duration_micros / 1e6, *labels)
+
+    def failed(self, event):
+        labels = self._pending.pop(event.request_id, (event.command_name, ""))
+        metrics.mongo_seconds.observe(event.duration_micros / 1e6, *labels)
+        metrics.mongo_failures.inc(*labels)
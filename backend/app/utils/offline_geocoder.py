@@ -0,0 +1,108 @@
+"""
+Offline reverse geocoder backed by a bundled locality gazetteer.
+
+Features are read from a GeoJSON file (points or polygons with a `Name`
+property) and indexed with a shapely STRtree, so resolving a coordinate to a
+locality name is an in-process lookup instead of a Nominatim round trip.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+import shapely
+from shapely.geometry import shape
+from shapely.ops import transform
+from shapely.strtree import STRtree
+
+# Kilometres per degree, used for a local equirectangular projection so STRtree
+# distances come out in km.
+_KM_PER_DEG_LAT = 110.574
+_KM_PER_DEG_LON_EQUATOR = 111.320
+
+
+class OfflineGeocoder:
+    """Resolves coordinates to locality names from a local GeoJSON gazetteer."""
+
+    def __init__(self, geojson_path: str, max_distance_km: float = 2.5):
+        self.geojson_path = Path(geojson_path)
+        self.max_distance_km = max_distance_km
+        self._lon_scale = _KM_PER_DEG_LON_EQUATOR
+        self._point_tree: Optional[STRtree] = None
+        self._point_names: List[str] = []
+        self._polygon_tree: Optional[STRtree] = None
+        self._polygon_names: List[str] = []
+        self.load_geojson()
+
+    def load_geojson(self):
+        """Load gazetteer features and build the spatial indexes."""
+        if not self.geojson_path.exists():
+            raise FileNotFoundError(f"Gazetteer file not found: {self.geojson_path}")
+
+        with self.geojson_path.open("r", encoding="utf-8") as f:
+            collection = json.load(f)
+
+        features = []
+        for feat in collection.get("features", []):
+            props = feat.get("properties") or {}
+            name = props.get("Name") or props.get("name")
+            if not name or not feat.get("geometry"):
+                continue
+            city = props.get("City") or props.get("city")
+            features.append((f"{name}, {city}" if city else name, shape(feat["geometry"])))
+
+        if not features:
+            return
+
+        # Project around the gazetteer's mean latitude; good to well under 1%
+        # across a single city.
+        mean_lat = float(np.mean([geom.centroid.y for _, geom in features]))
+        self._lon_scale = _KM_PER_DEG_LON_EQUATOR * math.cos(math.radians(mean_lat))
+
+        points, polygons = [], []
+        for name, geom in features:
+            projected = transform(self._project, geom)
+            if geom.geom_type in ("Polygon", "MultiPolygon"):
+                polygons.append(projected)
+                self._polygon_names.append(name)
+            else:
+                points.append(projected.centroid)
+                self._point_names.append(name)
+
+        if points:
+            self._point_tree = STRtree(points)
+        if polygons:
+            self._polygon_tree = STRtree(polygons)
+
+    def _project(self, x, y, z=None):
+        return np.asarray(x) * self._lon_scale, np.asarray(y) * _KM_PER_DEG_LAT
+
+    def lookup(self, lat: float, lon: float) -> Optional[str]:
+        """Return the locality name for a coordinate, or None if nothing is close enough."""
+        return self.lookup_many([lat], [lon])[0]
+
+    def lookup_many(self, lats: Sequence[float], lons: Sequence[float]) -> List[Optional[str]]:
+        """Vectorized lookup: polygons containing the point win, then the nearest named point."""
+        xs = np.asarray(lons, dtype=float) * self._lon_scale
+        ys = np.asarray(lats, dtype=float) * _KM_PER_DEG_LAT
+        query_points = shapely.points(xs, ys)
+        results: List[Optional[str]] = [None] * len(query_points)
+
+        if self._polygon_tree is not None:
+            input_idx, tree_idx = self._polygon_tree.query(query_points, predicate="within")
+            for i, j in zip(input_idx, tree_idx):
+                if results[i] is None:
+                    results[i] = self._polygon_names[j]
+
+        if self._point_tree is not None:
+            pending = [i for i, name in enumerate(results) if name is None]
+            if pending:
+                input_idx, tree_idx = self._point_tree.query_nearest(
+                    query_points[pending], max_distance=self.max_distance_km, all_matches=False
+                )
+                for i, j in zip(input_idx, tree_idx):
+                    results[pending[i]] = self._point_names[j]
+
+        return results
@@ -0,0 +1,92 @@
+"""
+Keyset pagination and NDJSON streaming helpers for MongoDB collections.
+
+Pages are ordered newest first on (time field, _id), and the cursor handed
+to clients is an opaque token for the last document of the previous page,
+so every page costs one index range scan however deep the client pages.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+
+def encode_cursor(ts: datetime, doc_id: Any) -> str:
+    raw = json.dumps({"t": ts.isoformat(), "id": str(doc_id)}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Raises ValueError for malformed or tampered cursors."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+
+def time_range_query(time_field: str, start: Optional[datetime], end: Optional[datetime]) -> Dict[str, Any]:
+    bounds: Dict[str, Any] = {}
+    if start:
+        bounds["$gte"] = start
+    if end:
+        bounds["$lte"] = end
+    return {time_field: bounds} if bounds else {}
+
+
+def keyset_query(query: Dict[str, Any], time_field: str, cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict `query` to documents strictly after `cursor` in newest-first order."""
+    if not cursor:
+        return query
+    ts, doc_id = decode_cursor(cursor)
+    after = {"$or": [{time_field: {"$lt": ts}}, {time_field: ts, "_id": {"$lt": doc_id}}]}
+    return {"$and": [query, after]} if query else after
+
+
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    time_field: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return up to `limit` documents and the cursor for the next page (None on the last page)."""
+    docs = (
+        await collection.find(keyset_query(query, time_field, cursor), projection)
+        .sort([(time_field, -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(last[time_field], last["_id"])
+    return docs, next_cursor
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def stream_ndjson(cursor, batch_size: int) -> AsyncIterator[bytes]:
+    """
+    Encode a Motor cursor as newline-delimited JSON, one chunk per batch.
+    Memory stays bounded by `batch_size` documents regardless of result size.
+    """
+    lines: List[str] = []
+    async for doc in cursor.batch_size(batch_size):
+        lines.append(json.dumps(doc, default=_json_default, separators=(",", ":")))
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
@@ -0,0 +1,117 @@
+"""
+Failure isolation for outbound calls (OpenWeather, Nominatim).
+
+`CircuitBreaker` opens after a run of consecutive failures so callers fail
+fast instead of each waiting out the upstream timeout; after `reset_seconds`
+one trial call is let through and its outcome closes or re-opens the circuit.
+`hedged()` starts a second identical request when the first is slower than
+`delay` and returns whichever succeeds first.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.utils.metrics import Counter, Gauge, metrics
+
+T = TypeVar("T")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+circuit_state = metrics.register(
+    Gauge("rainsafe_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["upstream"])
+)
+circuit_rejections = metrics.register(
+    Counter("rainsafe_circuit_rejected_total", "Calls short-circuited by an open breaker", ["upstream"])
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        circuit_state.set(_STATE_VALUES[CLOSED], name)
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            print(f"🔌 Circuit '{self.name}' {self.state} -> {state}")
+            self.state = state
+            circuit_state.set(_STATE_VALUES[state], self.name)
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; False means fail fast."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        circuit_rejections.inc(self.name)
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn` through the breaker; raises CircuitOpenError when open."""
+        if not self.allow():
+            raise CircuitOpenError(f"circuit '{self.name}' is open")
+        try:
+            result = await fn()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # Not the upstream's fault; free the trial slot without counting it.
+                self._trial_in_flight = False
+            else:
+                self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+async def hedged(fn: Callable[[], Awaitable[T]], delay: Optional[float]) -> T:
+    """
+    Await `fn()`; if it hasn't finished after `delay` seconds, start a second
+    `fn()` and return the first success. Without a delay this is just `fn()`.
+    """
+    if not delay:
+        return await fn()
+    first = asyncio.ensure_future(fn())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+    pending = {first, asyncio.ensure_future(fn())}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,164 @@
+"""
+Response cache for polled read endpoints (/risk, /dashboard-data, /alerts/recent).
+
+GET responses of the routes in RESPONSE_CACHE_ROUTES are cached in memory
+under the path plus the sorted query string, with configured parameters
+rounded first (e.g. /risk lat/lon to ~110 m, and the request is rewritten to
+the rounded values, so every point in a cell gets the cell's answer). Entries
+carry tags; writes call `invalidate("reports")` / `invalidate("alerts")` to
+drop what they affect, and the TTL bounds staleness from writes this process
+doesn't see. Responses get an ETag and `Cache-Control: max-age` so browsers
+and CDNs can cache and revalidate too.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.utils.metrics import Counter, metrics
+from config.settings import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_ROUTES
+
+cache_requests = metrics.register(
+    Counter("rainsafe_response_cache_requests_total", "Response cache lookups by outcome", ["route", "result"])
+)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    media_type: Optional[str]
+    etag: str
+    expires_at: float
+    tags: Tuple[str, ...]
+
+
+class ResponseCache:
+    """LRU of encoded responses with per-route TTLs and tag invalidation."""
+
+    def __init__(self, routes: Dict[str, dict] = RESPONSE_CACHE_ROUTES, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.routes = routes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._by_tag: Dict[str, Set[str]] = {}
+        # Bumped on invalidation so a response computed before a write isn't stored after it.
+        self._generations: Dict[str, int] = {}
+
+    def normalize_query(self, path: str, query_string: str) -> str:
+        """Sorted query string with the route's quantized params rounded."""
+        quantize = self.routes[path].get("quantize", {})
+        params: List[Tuple[str, str]] = []
+        for name, value in parse_qsl(query_string, keep_blank_values=True):
+            if name in quantize:
+                try:
+                    value = f"{float(value):.{quantize[name]}f}"
+                except ValueError:
+                    pass  # left for the endpoint to reject
+            params.append((name, value))
+        return urlencode(sorted(params))
+
+    def generation(self, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        for tag in entry.tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for tag in entry.tags:
+                self._by_tag.get(tag, set()).discard(key)
+
+    def invalidate(self, tag: str) -> None:
+        """Drop every cached response tagged `tag` (e.g. after a report or alert write)."""
+        self._generations[tag] = self._generations.get(tag, 0) + 1
+        for key in list(self._by_tag.get(tag, ())):
+            self._drop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_tag.clear()
+
+
+def _headers(etag: str, expires_at: float) -> Dict[str, str]:
+    max_age = max(0, int(expires_at - time.monotonic()))
+    return {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Serves cached GET responses and conditional 304s for the configured routes."""
+
+    def __init__(self, app, cache: "ResponseCache"):
+        super().__init__(app)
+        self.cache = cache
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        policy = self.cache.routes.get(path)
+        if request.method != "GET" or policy is None:
+            return await call_next(request)
+
+        query = self.cache.normalize_query(path, request.scope["query_string"].decode("latin-1"))
+        request.scope["query_string"] = query.encode("latin-1")
+        key = f"{path}?{query}"
+        if_none_match = request.headers.get("if-none-match")
+
+        entry = None
+        if "no-cache" not in request.headers.get("cache-control", ""):
+            entry = self.cache.get(key)
+        if entry is not None:
+            cache_requests.inc(path, "hit")
+            headers = _headers(entry.etag, entry.expires_at)
+            if if_none_match == entry.etag:
+                return Response(status_code=304, headers=headers)
+            return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+        cache_requests.inc(path, "miss")
+        tags = tuple(policy.get("tags", ()))
+        generation = self.cache.generation(tags)
+        response = await call_next(request)
+        # Endpoints opt out of caching a response (e.g. a degraded answer) with no-store.
+        if response.status_code != 200 or "no-store" in response.headers.get("cache-control", ""):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        # Keep an ETag the endpoint already computed (e.g. the recent alerts buffer's).
+        etag = response.headers.get("etag") or '"%s"' % hashlib.sha1(body).hexdigest()[:32]
+        entry = CachedResponse(
+            body=body,
+            media_type=response.headers.get("content-type"),
+            etag=etag,
+            expires_at=time.monotonic() + policy["ttl"],
+            tags=tags,
+        )
+        if self.cache.generation(tags) == generation:
+            self.cache.put(key, entry)
+
+        headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "etag", "cache-control")}
+        headers.update(_headers(etag, entry.expires_at))
+        if if_none_match == etag:
+            return Response(status_code=304, headers=_headers(etag, entry.expires_at))
+        return Response(content=body, status_code=200, headers=headers, media_type=entry.media_type)
+
+
+# Global response cache; the middleware is only installed when RESPONSE_CACHE_ENABLED
+response_cache = ResponseCache()
@@ -0,0 +1,117 @@
+"""
+Optional OpenTelemetry tracing.
+
+With TRACING_ENABLED=true, `setup_tracing(app)` installs a tracer provider with
+ratio-based sampling and instruments FastAPI (one span per request), httpx
+(OpenWeather and Nominatim calls) and pymongo (every Motor operation). Stages
+wrapped with `timed()` also become spans, and queued jobs continue the trace of the
+request that enqueued them: `inject_carrier()` serializes the active context
+into the job document and the worker passes `extract_context()` of it to
+`background_span()`.
+
+The OpenTelemetry packages are only needed when tracing is enabled:
+
+    pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http \\
+        opentelemetry-instrumentation-fastapi opentelemetry-instrumentation-httpx \\
+        opentelemetry-instrumentation-pymongo
+"""
+
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import (
+    TRACING_ENABLED,
+    TRACING_EXPORTER,
+    TRACING_FILE_PATH,
+    TRACING_SAMPLE_RATIO,
+    TRACING_SERVICE_NAME,
+)
+
+# Set by setup_tracing(); None means tracing is off and every helper is a no-op.
+_tracer = None
+
+
+def setup_tracing(app=None) -> bool:
+    """
+    Configure the tracer provider, exporter and instrumentations. Returns True
+    if active. Processes without a FastAPI app (worker.py) pass no app.
+    """
+    global _tracer
+    if not TRACING_ENABLED or _tracer is not None:
+        return _tracer is not None
+    try:
+        from opentelemetry import trace
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        from opentelemetry.instrumentation.pymongo import PymongoInstrumentor
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError as e:
+        print(f"⚠️ TRACING_ENABLED is set but OpenTelemetry is not installed ({e}); tracing disabled")
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": TRACING_SERVICE_NAME}),
+        # Background tasks and outbound calls follow their request's sampling decision.
+        sampler=ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATIO)),
+    )
+    if TRACING_EXPORTER == "file":
+        path = Path(TRACING_FILE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        exporter = ConsoleSpanExporter(
+            out=path.open("a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    else:
+        # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+        # (default http://localhost:4318).
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        exporter = OTLPSpanExporter()
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    if app is not None:
+        FastAPIInstrumentor.instrument_app(app, excluded_urls="metrics")
+    HTTPXClientInstrumentor().instrument()
+    PymongoInstrumentor().instrument()
+
+    _tracer = trace.get_tracer("rainsafe")
+    print(f"✅ Tracing enabled ({TRACING_EXPORTER} exporter, sample ratio {TRACING_SAMPLE_RATIO})")
+    return True
+
+
+def stage_span(stage: str):
+    """Span for a `timed()` stage; a no-op context manager when tracing is off."""
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(stage)
+
+
+def inject_carrier() -> Dict[str, str]:
+    """The active trace context as W3C headers, for storing alongside queued work."""
+    carrier: Dict[str, str] = {}
+    if _tracer is not None:
+        from opentelemetry.propagate import inject
+
+        inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Optional[Dict[str, str]]) -> Optional[Any]:
+    """Rebuild a trace context stored by inject_carrier()."""
+    if _tracer is None or not carrier:
+        return None
+    from opentelemetry.propagate import extract
+
+    return extract(carrier)
+
+
+def background_span(name: str, parent_context: Optional[Any]):
+    """Span for a background task, parented to the request that scheduled it."""
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, context=parent_context)
@@ -0,0 +1,135 @@
+"""
+Current weather from OpenWeather with stale-while-revalidate caching.
+
+Readings are cached per rounded coordinate cell. A fresh reading is served
+as-is; a stale one (older than WEATHER_FRESH_SECONDS, younger than
+WEATHER_STALE_MAX_SECONDS) is served immediately, flagged as stale, while a
+background refresh for the cell runs. Concurrent requests for one cell share
+a single upstream call, which goes through a circuit breaker: while
+OpenWeather is down, requests fail fast and fall back to the last known
+reading instead of waiting out the timeout.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import httpx
+
+from app.utils.metrics import timed
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, hedged
+from config.settings import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    OPENWEATHER_API_KEY,
+    OPENWEATHER_BASE_URL,
+    WEATHER_CACHE_MAX_ENTRIES,
+    WEATHER_CACHE_PRECISION,
+    WEATHER_FRESH_SECONDS,
+    WEATHER_HEDGE_DELAY_SECONDS,
+    WEATHER_STALE_MAX_SECONDS,
+    WEATHER_TIMEOUT_SECONDS,
+)
+
+
+class WeatherReading(NamedTuple):
+    data: Dict[str, Any]
+    age_seconds: float
+    stale: bool
+
+
+class WeatherClient:
+    """Cached, circuit-broken access to OpenWeather's current conditions."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = OPENWEATHER_API_KEY,
+        precision: int = WEATHER_CACHE_PRECISION,
+        max_entries: int = WEATHER_CACHE_MAX_ENTRIES,
+        fresh_seconds: float = WEATHER_FRESH_SECONDS,
+        stale_max_seconds: float = WEATHER_STALE_MAX_SECONDS,
+        hedge_delay: float = WEATHER_HEDGE_DELAY_SECONDS,
+    ):
+        self.api_key = api_key or ""
+        self.precision = precision
+        self.max_entries = max_entries
+        self.fresh_seconds = fresh_seconds
+        self.stale_max_seconds = stale_max_seconds
+        self.hedge_delay = hedge_delay
+        self.breaker = CircuitBreaker("openweather", CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+        # cell -> (monotonic fetch time, payload)
+        self._cache: "OrderedDict[Tuple[float, float], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[float, float], "asyncio.Task[Dict[str, Any]]"] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _cell(self, lat: float, lon: float) -> Tuple[float, float]:
+        return round(lat, self.precision), round(lon, self.precision)
+
+    def _http(self) -> httpx.AsyncClient:
+        # One pooled client per process instead of a new connection per request.
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=WEATHER_TIMEOUT_SECONDS)
+        return self._client
+
+    async def _request(self, lat: float, lon: float) -> Dict[str, Any]:
+        res = await self._http().get(
+            f"{OPENWEATHER_BASE_URL}/weather",
+            params={"lat": lat, "lon": lon, "appid": self.api_key, "units": "metric"},
+        )
+        res.raise_for_status()
+        data = res.json()
+        if "main" not in data:
+            raise ValueError("response has no 'main' section")
+        return data
+
+    @timed("weather.fetch")
+    async def _fetch(self, cell: Tuple[float, float]) -> Dict[str, Any]:
+        data = await self.breaker.call(lambda: hedged(lambda: self._request(*cell), self.hedge_delay))
+        self._cache[cell] = (time.monotonic(), data)
+        self._cache.move_to_end(cell)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return data
+
+    def _start_fetch(self, cell: Tuple[float, float]) -> "asyncio.Task[Dict[str, Any]]":
+        task = self._inflight.get(cell)
+        if task is None:
+            task = asyncio.create_task(self._fetch(cell))
+            self._inflight[cell] = task
+            task.add_done_callback(lambda t: self._done(cell, t))
+        return task
+
+    def _done(self, cell: Tuple[float, float], task: "asyncio.Task[Dict[str, Any]]") -> None:
+        self._inflight.pop(cell, None)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and not isinstance(error, CircuitOpenError):
+            print(f"⚠️ Weather fetch failed for cell {cell}: {error}")
+
+    async def get(self, lat: float, lon: float) -> Optional[WeatherReading]:
+        """Weather for the point's cell, or None if neither upstream nor cache has any."""
+        if not self.api_key:
+            print("⚠️ Missing OpenWeather API key.")
+            return None
+        cell = self._cell(lat, lon)
+        cached = self._cache.get(cell)
+        if cached is not None:
+            age = time.monotonic() - cached[0]
+            if age <= self.fresh_seconds:
+                return WeatherReading(cached[1], age, stale=False)
+            if age <= self.stale_max_seconds:
+                self._start_fetch(cell)
+                return WeatherReading(cached[1], age, stale=True)
+
+        try:
+            # Shielded: a cancelled request doesn't cancel the fetch other requests await.
+            return WeatherReading(await asyncio.shield(self._start_fetch(cell)), 0.0, stale=False)
+        except Exception:
+            # Logged by _done(); nothing usable is cached for this cell.
+            return None
+
+
+# Global weather client
+weather_client = WeatherClient()
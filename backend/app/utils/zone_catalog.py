@@ -0,0 +1,140 @@
+"""
+Catalog of per-city flood zone sets.
+
+Each city in FLOOD_ZONE_CATALOG has its own zone file and FloodZoneChecker
+(with its own STRtree indexes), loaded the first time a point in that city
+is looked up. A top-level STRtree over the city bounding boxes routes points
+to their city, so startup cost doesn't depend on how many cities are
+configured. Loaded cities are kept in an LRU and the least recently used are
+unloaded once FLOOD_ZONE_MAX_LOADED_CITIES or FLOOD_ZONE_MAX_LOADED_FEATURES
+is exceeded; an unloaded city is simply read again on its next lookup.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import box
+from shapely.geometry.base import BaseGeometry
+from shapely.strtree import STRtree
+
+from app.utils.flood_zones import FloodZoneChecker, proximity_score
+from app.utils.metrics import timed
+from config.settings import (
+    FLOOD_ZONE_CATALOG,
+    FLOOD_ZONE_MAX_LOADED_CITIES,
+    FLOOD_ZONE_MAX_LOADED_FEATURES,
+    FLOOD_ZONE_ROUTE_MARGIN_DEG,
+)
+
+
+class FloodZoneCatalog:
+    """Routes points to lazily loaded per-city FloodZoneCheckers."""
+
+    def __init__(
+        self,
+        cities: Sequence[Dict] = FLOOD_ZONE_CATALOG,
+        base_dir: Optional[Path] = None,
+        max_loaded_cities: int = FLOOD_ZONE_MAX_LOADED_CITIES,
+        max_loaded_features: int = FLOOD_ZONE_MAX_LOADED_FEATURES,
+        margin_deg: float = FLOOD_ZONE_ROUTE_MARGIN_DEG,
+    ):
+        self.cities = [entry["city"] for entry in cities]
+        self.paths = {
+            entry["city"]: (base_dir / entry["path"] if base_dir else Path(entry["path"])) for entry in cities
+        }
+        self._router = STRtree([box(*entry["bbox"]).buffer(margin_deg, join_style="mitre") for entry in cities])
+        self.max_loaded_cities = max_loaded_cities
+        self.max_loaded_features = max_loaded_features
+        self._loaded: "OrderedDict[str, FloodZoneChecker]" = OrderedDict()
+        self._unavailable: Set[str] = set()
+
+    @property
+    def loaded_cities(self) -> List[str]:
+        return list(self._loaded)
+
+    def city_for(self, lat: float, lon: float) -> Optional[str]:
+        """Name of the city whose (padded) bounding box contains the point."""
+        hits = self._router.query(shapely.points(lon, lat), predicate="intersects")
+        return self.cities[int(hits.min())] if len(hits) else None
+
+    def checker(self, city: str) -> Optional[FloodZoneChecker]:
+        """The city's checker, loading it (and evicting others) if needed; None if it has no zone file."""
+        checker = self._loaded.get(city)
+        if checker is not None:
+            self._loaded.move_to_end(city)
+            return checker
+        if city in self._unavailable:
+            return None
+        try:
+            checker = FloodZoneChecker(str(self.paths[city]))
+        except Exception as e:
+            print(f"⚠️ No flood zones for {city}: {e}")
+            self._unavailable.add(city)
+            return None
+        print(f"✅ Loaded {len(checker.zones)} flood zones for {city}")
+        self._loaded[city] = checker
+        self._evict()
+        return checker
+
+    def _evict(self) -> None:
+        # The most recently loaded city always stays, even if it alone exceeds the budget.
+        while len(self._loaded) > 1 and (
+            len(self._loaded) > self.max_loaded_cities
+            or sum(len(c.zones) for c in self._loaded.values()) > self.max_loaded_features
+        ):
+            city, _ = self._loaded.popitem(last=False)
+            print(f"♻️ Unloaded flood zones for {city}")
+
+    @timed("zone_catalog.distance")
+    def distance_many(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        """
+        Distance in km from each point to the nearest flood zone of its city
+        (0 inside a zone polygon); inf outside every city or where a city has
+        no zones. Points are grouped so each city gets one vectorized query.
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        distances = np.full(lats.shape[0], np.inf)
+        if lats.shape[0] == 0:
+            return distances
+
+        input_idx, city_idx = self._router.query(shapely.points(lons, lats), predicate="intersects")
+        # Where padded boxes overlap, a point goes to the first matching city.
+        order = np.lexsort((city_idx, input_idx))
+        input_idx, city_idx = input_idx[order], city_idx[order]
+        first = np.unique(input_idx, return_index=True)[1]
+        input_idx, city_idx = input_idx[first], city_idx[first]
+
+        for i in np.unique(city_idx):
+            checker = self.checker(self.cities[int(i)])
+            if checker is None:
+                continue
+            members = input_idx[city_idx == i]
+            distances[members] = checker.distance_many(lats[members], lons[members])
+        return distances
+
+    def proximity_many(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        return proximity_score(self.distance_many(lats, lons))
+
+    def is_in_flood_zone(self, lat: float, lon: float) -> bool:
+        city = self.city_for(lat, lon)
+        checker = self.checker(city) if city else None
+        return checker.is_in_flood_zone(lat, lon) if checker else False
+
+    def zones_in_bbox(
+        self, min_lon: float, min_lat: float, max_lon: float, max_lat: float
+    ) -> List[Tuple[str, BaseGeometry]]:
+        """(name, geometry) of every zone intersecting a lon/lat box, across the cities it overlaps."""
+        zones: List[Tuple[str, BaseGeometry]] = []
+        for i in sorted(self._router.query(box(min_lon, min_lat, max_lon, max_lat), predicate="intersects")):
+            checker = self.checker(self.cities[int(i)])
+            if checker is not None:
+                zones.extend(checker.zones_in_bbox(min_lon, min_lat, max_lon, max_lat))
+        return zones
+
+
+# Global flood zone catalog
+zone_catalog = FloodZoneCatalog()
@@ -0,0 +1,110 @@
+"""
+RainSafe - Reverse geocoding benchmark
+
+Compares the offline gazetteer geocoder with live Nominatim lookups.
+Run from the backend directory:
+
+    python benchmarks/geocoder_benchmark.py --points 10000 --nominatim 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.geocoder import fetch_nominatim_name  # noqa: E402
+from app.utils.offline_geocoder import OfflineGeocoder  # noqa: E402
+from config.settings import GEOCODER_GAZETTEER_PATH, GEOCODER_MAX_DISTANCE_KM  # noqa: E402
+
+# Roughly the BBMP limits.
+BANGALORE_BBOX = (12.83, 77.46, 13.14, 77.78)  # min_lat, min_lon, max_lat, max_lon
+
+
+def random_points(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    min_lat, min_lon, max_lat, max_lon = BANGALORE_BBOX
+    return [(rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon)) for _ in range(n)]
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(latencies_s, total_s: float) -> dict:
+    ms = [x * 1000 for x in latencies_s]
+    return {
+        "calls": len(ms),
+        "p50_ms": round(percentile(ms, 50), 4),
+        "p95_ms": round(percentile(ms, 95), 4),
+        "p99_ms": round(percentile(ms, 99), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "throughput_per_s": round(len(ms) / total_s, 1) if total_s else None,
+    }
+
+
+def bench_offline(points) -> dict:
+    start = time.perf_counter()
+    geocoder = OfflineGeocoder(GEOCODER_GAZETTEER_PATH, max_distance_km=GEOCODER_MAX_DISTANCE_KM)
+    load_s = time.perf_counter() - start
+
+    latencies = []
+    start = time.perf_counter()
+    for lat, lon in points:
+        t0 = time.perf_counter()
+        geocoder.lookup(lat, lon)
+        latencies.append(time.perf_counter() - t0)
+    single = summarize(latencies, time.perf_counter() - start)
+
+    lats, lons = zip(*points)
+    start = time.perf_counter()
+    names = geocoder.lookup_many(lats, lons)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "index_build_ms": round(load_s * 1000, 2),
+        "single": single,
+        "batch": {
+            "points": len(points),
+            "total_ms": round(batch_s * 1000, 2),
+            "throughput_per_s": round(len(points) / batch_s, 1) if batch_s else None,
+            "resolved_pct": round(100 * sum(n is not None for n in names) / len(names), 1),
+        },
+    }
+
+
+async def bench_nominatim(points) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    for lat, lon in points:
+        t0 = time.perf_counter()
+        await fetch_nominatim_name(lat, lon)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=10000, help="points for the offline geocoder")
+    parser.add_argument("--nominatim", type=int, default=0, help="live Nominatim calls (rate limited to 1/s)")
+    parser.add_argument("--output", type=str, help="write results JSON to this file")
+    args = parser.parse_args()
+
+    results = {"offline": bench_offline(random_points(args.points))}
+    if args.nominatim > 0:
+        results["nominatim"] = asyncio.run(bench_nominatim(random_points(args.nominatim, seed=7)))
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+RainSafe - API load test
+
+Starts `main:app` under uvicorn (plus a `worker.py` job worker) against a
+local MongoDB (or mongomock-motor, API only) with local stand-ins for
+OpenWeather and Nominatim, seeds reports through
+POST /report, then drives each endpoint at a fixed concurrency and prints
+p50/p95/p99 latency and requests/s as JSON. Run from the backend directory:
+
+    python benchmarks/load_test.py --mongo-uri mongodb://localhost:27017 --seed 2000 --requests 2000
+    python benchmarks/load_test.py --mongomock --concurrency 16 --output load.json
+
+Save the JSON per commit and compare; numbers are only comparable on the same machine.
+mongomock implements only part of the aggregation language, so /dashboard-data
+may report errors under --mongomock; use a real mongod for representative results.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Roughly the BBMP limits.
+BANGALORE_BBOX = (12.83, 77.46, 13.14, 77.78)  # min_lat, min_lon, max_lat, max_lon
+WATER_LEVELS = ["Ankle-deep", "Knee-deep", "Waist-deep", "Chest-deep", "Above head"]
+ENDPOINTS = ["risk", "report", "dashboard", "alerts_recent"]
+
+
+# --- Upstream stand-ins ---
+
+
+def stub_handler(latency_s: float):
+    """Serves OpenWeather /weather and Nominatim /reverse with canned payloads."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency_s)
+            if self.path.startswith("/weather"):
+                body = {
+                    "main": {"temp": 26.5, "humidity": 88, "pressure": 1006},
+                    "rain": {"1h": round(random.uniform(0, 25), 1)},
+                    "weather": [{"main": "Rain", "description": "moderate rain"}],
+                    "wind": {"speed": 4.2},
+                    "name": "Bengaluru",
+                }
+            elif self.path.startswith("/reverse"):
+                body = {"display_name": "Koramangala, Bengaluru, Karnataka, India"}
+            else:
+                self.send_error(404)
+                return
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_stub_server(latency_s: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), stub_handler(latency_s))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# --- API server ---
+
+
+def serve(port: int, mongomock: bool) -> None:
+    """Entry point of the API subprocess (`load_test.py --serve`)."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.chdir(BACKEND_DIR)
+    if mongomock:
+        import mongomock_motor
+        import motor.motor_asyncio
+
+        motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+
+    import uvicorn
+
+    from main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def upstream_env(args, stub_url: str) -> Dict[str, str]:
+    return {
+        **os.environ,
+        "MONGO_URI": args.mongo_uri,
+        "DATABASE_NAME": args.database,
+        "OPENWEATHER_API_KEY": "load-test",
+        "OPENWEATHER_BASE_URL": stub_url,
+        "NOMINATIM_URL": f"{stub_url}/reverse",
+    }
+
+
+def start_api(args, stub_url: str) -> subprocess.Popen:
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--serve", "--port", str(args.port)]
+    if args.mongomock:
+        cmd.append("--mongomock")
+    return subprocess.Popen(cmd, env=upstream_env(args, stub_url), cwd=BACKEND_DIR)
+
+
+def start_worker(args, stub_url: str) -> Optional[subprocess.Popen]:
+    """Job worker for the assessments POST /report enqueues; mongomock can't be shared across processes."""
+    if args.mongomock:
+        return None
+    return subprocess.Popen([sys.executable, "worker.py"], env=upstream_env(args, stub_url), cwd=BACKEND_DIR)
+
+
+async def wait_until_up(base_url: str, proc: subprocess.Popen, timeout_s: float = 60) -> None:
+    deadline = time.monotonic() + timeout_s
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise SystemExit(f"❌ API process exited with code {proc.returncode}")
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise SystemExit("❌ API did not start in time")
+
+
+def drop_database(args) -> None:
+    if args.mongomock:
+        return
+    import pymongo
+
+    with pymongo.MongoClient(args.mongo_uri, serverSelectionTimeoutMS=5000) as client:
+        client.drop_database(args.database)
+
+
+# --- Load generation ---
+
+
+def random_point(rng: random.Random):
+    min_lat, min_lon, max_lat, max_lon = BANGALORE_BBOX
+    return round(rng.uniform(min_lat, max_lat), 6), round(rng.uniform(min_lon, max_lon), 6)
+
+
+def request_factory(name: str, rng: random.Random) -> Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]:
+    def risk(client):
+        lat, lon = random_point(rng)
+        return client.get("/risk", params={"lat": lat, "lon": lon})
+
+    def report(client):
+        lat, lon = random_point(rng)
+        return client.post(
+            "/report",
+            json={
+                "latitude": lat,
+                "longitude": lon,
+                "description": "Load test report",
+                "water_level": rng.choice(WATER_LEVELS),
+            },
+        )
+
+    def dashboard(client):
+        return client.get("/dashboard-data")
+
+    def alerts_recent(client):
+        return client.get("/alerts/recent", params={"limit": 50})
+
+    return {"risk": risk, "report": report, "dashboard": dashboard, "alerts_recent": alerts_recent}[name]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def drive(base_url: str, name: str, total: int, concurrency: int, seed: int) -> Dict[str, float]:
+    """Issue `total` requests from `concurrency` workers; latency is per request."""
+    rng = random.Random(seed)
+    make_request = request_factory(name, rng)
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            t0 = time.perf_counter()
+            try:
+                response = await make_request(client)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    ms = [x * 1000 for x in latencies]
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "rps": round(len(ms) / elapsed, 1) if elapsed else None,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except Exception:
+        return None
+
+
+async def run(args) -> Dict[str, object]:
+    stub = start_stub_server(args.upstream_latency_ms / 1000)
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}"
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    drop_database(args)
+    proc = start_api(args, stub_url)
+    worker = start_worker(args, stub_url)
+    try:
+        await wait_until_up(base_url, proc)
+        results: Dict[str, object] = {
+            "commit": git_commit(),
+            "config": {
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "seed_reports": args.seed,
+                "upstream_latency_ms": args.upstream_latency_ms,
+                "backend": "mongomock" if args.mongomock else "mongod",
+            },
+        }
+        if args.seed:
+            print(f"🌱 Seeding {args.seed} reports...", file=sys.stderr)
+            results["seed"] = await drive(base_url, "report", args.seed, args.concurrency, seed=0)
+            await asyncio.sleep(1)  # let the worker drain queued risk assessments
+
+        endpoints: Dict[str, object] = {}
+        for i, name in enumerate(args.endpoints, start=1):
+            print(f"🚀 {name}: {args.requests} requests at concurrency {args.concurrency}", file=sys.stderr)
+            endpoints[name] = await drive(base_url, name, args.requests, args.concurrency, seed=i)
+        results["endpoints"] = endpoints
+        return results
+    finally:
+        for p in (proc, worker):
+            if p is not None:
+                p.terminate()
+                p.wait(timeout=10)
+        stub.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="rainsafe_loadtest", help="dropped before each run")
+    parser.add_argument("--mongomock", action="store_true", help="use mongomock-motor instead of a mongod")
+    parser.add_argument("--port", type=int, default=0, help="API port (default: a free port)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per endpoint")
+    parser.add_argument("--seed", type=int, default=1000, help="reports created before measuring")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--upstream-latency-ms", type=float, default=20, help="stub OpenWeather/Nominatim delay")
+    parser.add_argument("--output", type=str, help="write results JSON to this file")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.mongomock)
+        return
+
+    args.port = args.port or free_port()
+    results = asyncio.run(run(args))
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
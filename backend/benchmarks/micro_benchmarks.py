@@ -0,0 +1,396 @@
+"""
+RainSafe - Micro-benchmarks for hot paths
+
+Times flood-zone lookups, model prediction at batch sizes 1-10k, feature
+preparation, risk decision, Pydantic model construction, dashboard
+classification and response serialization (model + stdlib json path vs the
+orjson fast path) on synthetic data at realistic scale. Run from the backend
+directory:
+
+    python benchmarks/micro_benchmarks.py                      # print results as JSON
+    python benchmarks/micro_benchmarks.py --save-baseline      # record benchmarks/micro_baseline.json
+    python benchmarks/micro_benchmarks.py --check              # exit 1 on regression
+    python benchmarks/micro_benchmarks.py --filter predictor   # only matching benchmarks
+
+--check fails when a benchmark is slower than `--tolerance` x its recorded
+baseline (baselines are machine-specific: record them on the machine that
+runs the check) or exceeds one of the absolute per-op budgets in BUDGETS_US.
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import orjson
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.feature_transform import FeatureTransform  # noqa: E402
+from app.models.flood_predictor import FloodPredictor  # noqa: E402
+from app.models.schemas import Alert, AssessmentSource, MapPoint, Report, RiskLevel  # noqa: E402
+from app.services.dashboard_service import classify_water_level  # noqa: E402
+from app.services.dashboard_stats import report_increments  # noqa: E402
+from app.services.recent_alerts import validate_alert_docs  # noqa: E402
+from app.services.risk_service import RiskAssessmentService  # noqa: E402
+from app.utils.flood_zones import FloodZoneChecker  # noqa: E402
+from app.utils.zone_catalog import FloodZoneCatalog  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "micro_baseline.json"
+
+# Roughly the BBMP limits.
+BANGALORE_BBOX = (12.83, 77.46, 13.14, 77.78)  # min_lat, min_lon, max_lat, max_lon
+WATER_LEVELS = ["Ankle-deep", "Knee-deep", "Waist-deep", "Chest-deep", "Above head", None]
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+# Absolute per-op ceilings (microseconds) that hold on any machine.
+BUDGETS_US = {
+    "flood_zones.distance_many[10000]": 1000.0,  # sub-millisecond per point
+    "zone_catalog.distance_many[10000]": 1000.0,
+}
+
+# name -> setup returning (callable, operations per call)
+BENCHMARKS: Dict[str, Callable[[], Tuple[Callable[[], Any], int]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+# --- Synthetic data ---
+
+
+def random_points(n: int, seed: int = 42) -> List[Tuple[float, float]]:
+    rng = random.Random(seed)
+    min_lat, min_lon, max_lat, max_lon = BANGALORE_BBOX
+    return [(rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon)) for _ in range(n)]
+
+
+def random_features(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Rows shaped like gather_features_for_prediction output."""
+    rng = random.Random(seed)
+    return [
+        {
+            "Temperature": rng.uniform(18, 34),
+            "Humidity": rng.uniform(40, 100),
+            "Rainfall_Intensity": rng.expovariate(1 / 8),
+            "Latitude": lat,
+            "Longitude": lon,
+            "Altitude": rng.uniform(850, 960),
+            "River_Level": rng.uniform(1, 9),
+            "flood_proximity_score": rng.random(),
+            "in_flood_zone": 0,
+        }
+        for lat, lon in random_points(n, seed)
+    ]
+
+
+def random_report_docs(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "_id": f"{i:024x}",
+            "latitude": lat,
+            "longitude": lon,
+            "description": "Water logging near the main road after heavy rain",
+            "water_level": rng.choice(WATER_LEVELS),
+            "created_at": now - timedelta(minutes=rng.randint(0, 48 * 60)),
+        }
+        for i, (lat, lon) in enumerate(random_points(n, seed))
+    ]
+
+
+def random_alert_docs(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "_id": f"{i:024x}",
+            "location_name": "Koramangala, Bengaluru",
+            "risk_level": rng.choice(["Medium", "High"]),
+            "message": "High flood risk detected. Avoid travel in this area.",
+            "source": "ml-prediction",
+            "sent_at": now - timedelta(minutes=rng.randint(0, 600)),
+        }
+        for i in range(n)
+    ]
+
+
+def random_map_point_rows(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Rows shaped like the dashboard pipeline's map point projection."""
+    return [
+        {
+            "id": doc["_id"],
+            "latitude": doc["latitude"],
+            "longitude": doc["longitude"],
+            "risk_level": classify_water_level(doc["water_level"]).value,
+            "source": AssessmentSource.USER_REPORT.value,
+            "details": doc["description"],
+        }
+        for doc in random_report_docs(n, seed)
+    ]
+
+
+# --- Benchmarks ---
+
+# Setups raise when the path under test is broken, so it reports as skipped
+# instead of timing an empty index or an exception handler.
+
+
+def _flood_checker() -> FloodZoneChecker:
+    checker = FloodZoneChecker("data/bangalore_flood_zones.kml")
+    if not checker.zones:
+        raise RuntimeError("no flood zones loaded")
+    return checker
+
+
+@benchmark("flood_zones.is_in_flood_zone")
+def _is_in_flood_zone():
+    checker, points = _flood_checker(), random_points(1000)
+    return (lambda: [checker.is_in_flood_zone(lat, lon) for lat, lon in points]), len(points)
+
+
+@benchmark("flood_zones.distance_many[10000]")
+def _distance_many():
+    checker, points = _flood_checker(), random_points(10000)
+    lats, lons = zip(*points)
+    return (lambda: checker.distance_many(lats, lons)), len(points)
+
+
+@benchmark("zone_catalog.distance_many[10000]")
+def _catalog_distance_many():
+    # Routed through the city bbox index; the city's zones are loaded in setup.
+    catalog, points = FloodZoneCatalog(), random_points(10000)
+    lats, lons = zip(*points)
+    checker = catalog.checker("Bengaluru")
+    if checker is None or not checker.zones:
+        raise RuntimeError("no Bengaluru flood zones in the catalog")
+    return (lambda: catalog.distance_many(lats, lons)), len(points)
+
+
+_predictor = None
+_predictor_error = None
+
+
+def _loaded_predictor() -> FloodPredictor:
+    global _predictor, _predictor_error
+    if _predictor is None and _predictor_error is None:
+        predictor = FloodPredictor()
+        # warm_up() runs a real prediction, so artifacts that load but don't fit together fail here.
+        if predictor.warm_up():
+            _predictor = predictor
+        else:
+            _predictor_error = "model artifacts could not be loaded or failed warm-up"
+    if _predictor is None:
+        raise RuntimeError(_predictor_error)
+    return _predictor
+
+
+def _register_predictor_benchmarks():
+    for size in BATCH_SIZES:
+
+        def predict(size=size):
+            predictor, rows = _loaded_predictor(), random_features(size)
+            return (lambda: predictor.predict(rows)), size
+
+        def predict_proba(size=size):
+            predictor, rows = _loaded_predictor(), random_features(size)
+            return (lambda: predictor.predict_proba(rows)), size
+
+        benchmark(f"predictor.predict[{size}]")(predict)
+        benchmark(f"predictor.predict_proba[{size}]")(predict_proba)
+
+
+_register_predictor_benchmarks()
+
+
+@benchmark("predictor._prepare_matrix[1000]")
+def _prepare_matrix():
+    predictor, rows = _loaded_predictor(), random_features(1000)
+    return (lambda: predictor._prepare_matrix(rows)), len(rows)
+
+
+@benchmark("feature_transform.transform_records[1000]")
+def _transform_records():
+    transform, rows = FeatureTransform(), random_features(1000)
+    return (lambda: transform.transform_records(rows)), len(rows)
+
+
+@benchmark("risk.decide_final_risk")
+def _decide_final_risk():
+    service = RiskAssessmentService(database=None)
+    rng = random.Random(42)
+    levels = [RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.UNKNOWN]
+    cases = [(rng.choice(levels), rng.choice(levels), rng.randint(0, 8)) for _ in range(1000)]
+    return (lambda: [service.decide_final_risk(t, m, n) for t, m, n in cases]), len(cases)
+
+
+@benchmark("schemas.Report[1000]")
+def _report_models():
+    docs = random_report_docs(1000)
+    return (lambda: [Report(**doc) for doc in docs]), len(docs)
+
+
+@benchmark("schemas.Alert[1000]")
+def _alert_models():
+    docs = random_alert_docs(1000)
+    return (lambda: [Alert(**doc) for doc in docs]), len(docs)
+
+
+@benchmark("dashboard.map_points[100]")
+def _map_points():
+    docs = random_report_docs(100)
+
+    def build():
+        return [
+            MapPoint(
+                id=doc["_id"],
+                latitude=doc["latitude"],
+                longitude=doc["longitude"],
+                risk_level=classify_water_level(doc["water_level"]),
+                source=AssessmentSource.USER_REPORT,
+                details=doc["description"],
+            ).model_dump(mode="json")
+            for doc in docs
+        ]
+
+    return build, len(docs)
+
+
+@benchmark("dashboard.classify_water_level[10000]")
+def _classify():
+    docs = random_report_docs(10000)
+    return (lambda: [classify_water_level(doc["water_level"]) for doc in docs]), len(docs)
+
+
+@benchmark("dashboard_stats.report_increments[10000]")
+def _increments():
+    docs = random_report_docs(10000)
+    return (lambda: [report_increments(doc) for doc in docs]), len(docs)
+
+
+# Response serialization: building models and encoding with the stdlib (what a
+# response_model endpoint returning models does) vs encoding the trusted
+# pipeline rows / once-validated payloads directly with orjson.
+
+_alert_list = TypeAdapter(List[Alert])
+
+
+def _register_serialization_benchmarks():
+    for size in (100, 1000, 10000):
+
+        def dashboard_models(size=size):
+            rows = random_map_point_rows(size)
+
+            def encode():
+                points = [MapPoint(**row) for row in rows]
+                return json.dumps({"map_points": [p.model_dump(mode="json") for p in points]}).encode("utf-8")
+
+            return encode, size
+
+        def dashboard_orjson(size=size):
+            rows = random_map_point_rows(size)
+            return (lambda: orjson.dumps({"map_points": rows})), size
+
+        benchmark(f"serialize.dashboard_models[{size}]")(dashboard_models)
+        benchmark(f"serialize.dashboard_orjson[{size}]")(dashboard_orjson)
+
+
+_register_serialization_benchmarks()
+
+
+@benchmark("serialize.alerts_models[200]")
+def _alerts_models():
+    docs = random_alert_docs(200)
+
+    def encode():
+        # validate_alert_docs, then the response_model pass validating the payloads again
+        payloads = validate_alert_docs([dict(doc) for doc in docs])
+        alerts = _alert_list.validate_python(payloads)
+        return json.dumps(_alert_list.dump_python(alerts, mode="json", by_alias=True)).encode("utf-8")
+
+    return encode, len(docs)
+
+
+@benchmark("serialize.alerts_orjson[200]")
+def _alerts_orjson():
+    docs = random_alert_docs(200)
+    return (lambda: orjson.dumps(validate_alert_docs([dict(doc) for doc in docs]))), len(docs)
+
+
+# --- Runner ---
+
+
+def measure(fn: Callable[[], Any], ops: int, repeat: int) -> Dict[str, float]:
+    """Best-of-`repeat` time per operation; each repeat runs for at least ~0.2 s."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"us_per_op": round(best / ops * 1e6, 3), "ops_per_s": round(ops / best, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {BASELINE_PATH.name}")
+    parser.add_argument("--check", action="store_true", help="compare against the baseline and budgets")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown vs baseline")
+    parser.add_argument("--output", type=str, help="write results JSON to this file")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    for name, setup in BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+        try:
+            fn, ops = setup()
+            results[name] = measure(fn, ops, args.repeat)
+        except Exception as e:
+            results[name] = {"skipped": str(e)}
+        print(f"⏱️ {name}: {results[name]}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    if args.save_baseline:
+        measured = {name: r for name, r in results.items() if "us_per_op" in r}
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8")) if BASELINE_PATH.exists() else {}
+        baseline.update(measured)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"✅ Baseline for {len(measured)} benchmarks saved to {BASELINE_PATH}", file=sys.stderr)
+
+    if args.check:
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8")) if BASELINE_PATH.exists() else {}
+        failures = []
+        for name, result in results.items():
+            if "us_per_op" not in result:
+                continue
+            limit = BUDGETS_US.get(name)
+            if limit is not None and result["us_per_op"] > limit:
+                failures.append(f"{name}: {result['us_per_op']} us/op exceeds budget {limit}")
+            if name in baseline and result["us_per_op"] > baseline[name]["us_per_op"] * args.tolerance:
+                failures.append(
+                    f"{name}: {result['us_per_op']} us/op vs baseline {baseline[name]['us_per_op']} "
+                    f"(> {args.tolerance}x)"
+                )
+        for failure in failures:
+            print(f"❌ {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+        print("✅ No regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
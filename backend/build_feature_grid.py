@@ -0,0 +1,98 @@
+"""
+Build the precomputed location-feature grid used by app/utils/feature_store.py.
+
+Each --layer NAME=PATH raster (GeoTIFF, or .npy with a .json sidecar holding
+origin_lon / origin_lat / cell_size_deg of its top-left corner) is resampled
+with nearest-neighbour onto one lat/lon grid covering --bbox, then all layers
+are stacked into data/feature_store/grid.npy (rows, cols, layers) + grid.json.
+
+    python build_feature_grid.py \\
+        --layer Altitude=data/rasters/dem.tif \\
+        --layer River_Level=data/rasters/river_level.npy
+
+The model uses the Altitude and River_Level layers; other layers are stored
+but not read by it.
+
+GeoTIFF input needs rasterio (pip install rasterio); .npy input needs only NumPy.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+from config.settings import FEATURE_STORE_PATH
+
+# Roughly the BBMP limits, padded.
+DEFAULT_BBOX = (77.40, 12.80, 77.85, 13.20)  # min_lon, min_lat, max_lon, max_lat
+DEFAULT_CELL_SIZE_DEG = 0.0005  # ~55 m
+
+
+def read_raster(path: Path) -> Tuple[np.ndarray, float, float, float, float]:
+    """(values, west, north, cell width, cell height) of a single-band raster."""
+    if path.suffix == ".npy":
+        meta = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        cell = float(meta["cell_size_deg"])
+        return np.load(path, mmap_mode="r"), float(meta["origin_lon"]), float(meta["origin_lat"]), cell, cell
+
+    try:
+        import rasterio
+    except ImportError as e:
+        raise SystemExit(f"❌ Reading {path} requires rasterio: {e}")
+    with rasterio.open(path) as src:
+        if src.crs and src.crs.to_epsg() != 4326:
+            raise SystemExit(f"❌ {path} must be in EPSG:4326 (lat/lon), got {src.crs}")
+        values = src.read(1, masked=True).astype(float).filled(np.nan)
+        t = src.transform
+        return values, t.c, t.f, t.a, -t.e
+
+
+def resample(path: Path, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Nearest-neighbour sample of one raster at every target cell centre; NaN outside it."""
+    values, west, north, cell_w, cell_h = read_raster(path)
+    rows = np.floor((north - lats) / cell_h).astype(np.int64)
+    cols = np.floor((lons - west) / cell_w).astype(np.int64)
+    inside = (rows >= 0) & (rows < values.shape[0]) & (cols >= 0) & (cols < values.shape[1])
+    out = np.full(lats.shape, np.nan, dtype=np.float32)
+    out[inside] = values[rows[inside], cols[inside]]
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layer", action="append", required=True, metavar="NAME=PATH")
+    parser.add_argument("--bbox", type=float, nargs=4, default=DEFAULT_BBOX, metavar=("MIN_LON", "MIN_LAT", "MAX_LON", "MAX_LAT"))
+    parser.add_argument("--cell-size", type=float, default=DEFAULT_CELL_SIZE_DEG, help="grid cell size in degrees")
+    parser.add_argument("--output", type=Path, default=Path(FEATURE_STORE_PATH))
+    args = parser.parse_args()
+
+    min_lon, min_lat, max_lon, max_lat = args.bbox
+    n_rows = int(np.ceil((max_lat - min_lat) / args.cell_size))
+    n_cols = int(np.ceil((max_lon - min_lon) / args.cell_size))
+    centre_lats = max_lat - (np.arange(n_rows) + 0.5) * args.cell_size
+    centre_lons = min_lon + (np.arange(n_cols) + 0.5) * args.cell_size
+    lats, lons = np.meshgrid(centre_lats, centre_lons, indexing="ij")
+
+    names, grids = [], []
+    for spec in args.layer:
+        name, _, path = spec.partition("=")
+        grids.append(resample(Path(path), lats, lons))
+        names.append(name)
+        print(f"🗺️ {name}: {np.isfinite(grids[-1]).mean():.0%} of cells covered by {path}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    np.save(args.output, np.stack(grids, axis=-1))
+    args.output.with_suffix(".json").write_text(
+        json.dumps(
+            {"layers": names, "origin_lon": min_lon, "origin_lat": max_lat, "cell_size_deg": args.cell_size},
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    print(f"✅ Wrote {n_rows}x{n_cols}x{len(names)} feature grid to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,14 +12,41 @@ load_dotenv()
 API_TITLE = "RainSafe API"
 API_VERSION = "1.0.0"
 API_DESCRIPTION = "Flood risk assessment and weather monitoring API"
+# Required (X-Admin-Token header) by admin routes such as POST /model/reload; unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
 
 # Database Configuration
 MONGO_URI = os.getenv("MONGO_URI")
-DATABASE_NAME = "rainsafe_db"
+DATABASE_NAME = os.getenv("DATABASE_NAME", "rainsafe_db")
 
 # External API Configuration
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
-OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5"
+OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5")
+NOMINATIM_URL = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org/reverse")
+
+# Outbound Call Resilience Configuration (app/utils/resilience.py)
+CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive failures before an upstream's circuit opens
+CIRCUIT_RESET_SECONDS = 30  # open circuits let one trial call through after this
+
+# Weather Cache Configuration (stale-while-revalidate per cell)
+WEATHER_TIMEOUT_SECONDS = 3.0
+WEATHER_CACHE_PRECISION = 2  # decimal places of lat/lon per weather cell (~1.1 km)
+WEATHER_CACHE_MAX_ENTRIES = 5000
+WEATHER_FRESH_SECONDS = 600  # OpenWeather updates current conditions about every 10 minutes
+WEATHER_STALE_MAX_SECONDS = 3 * 3600  # older readings are not served at all
+# Send a second request when the first is slower than this (0 disables hedging)
+WEATHER_HEDGE_DELAY_SECONDS = float(os.getenv("WEATHER_HEDGE_DELAY_SECONDS", "0"))
+
+# Reverse Geocoding Cache Configuration
+GEOCODE_CACHE_PRECISION = 3  # decimal places of lat/lon per cache cell (~110 m)
+GEOCODE_CACHE_MAX_ENTRIES = 5000  # in-memory LRU tier
+GEOCODE_CACHE_TTL_DAYS = 30  # persistent (MongoDB) tier
+NOMINATIM_MIN_INTERVAL_SECONDS = 1.0  # Nominatim usage policy: max 1 request/second
+
+# Offline Geocoder Configuration
+GEOCODER_GAZETTEER_PATH = "data/bangalore_localities.geojson"
+GEOCODER_MAX_DISTANCE_KM = 2.5  # beyond this the nearest locality is not used
+GEOCODER_NOMINATIM_FALLBACK = os.getenv("GEOCODER_NOMINATIM_FALLBACK", "true").lower() == "true"
 
 # Target Cities for Weather Data
 TARGET_CITIES = [
@@ -31,9 +58,38 @@ TARGET_CITIES = [
 ]
 
 # ML Model Configuration
-MODEL_PATH = "data/ml_artifacts/model.pkl"
-SCALER_PATH = "data/ml_artifacts/scaler.pkl"
-FEATURES_PATH = "data/ml_artifacts/model_features.pkl"
+# Fallback artifacts, used until a version is promoted in the model registry.
+# All three must come from one training run (the old xgb_model.pkl takes 7
+# inputs, not the 10 in model_features.pkl, so it can't be used here).
+MODEL_PATH = os.getenv("MODEL_PATH", "data/ml-artifacts/model.pkl")
+SCALER_PATH = os.getenv("SCALER_PATH", "data/ml-artifacts/scaler.pkl")
+FEATURES_PATH = os.getenv("FEATURES_PATH", "data/ml-artifacts/model_features.pkl")
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "data/ml-artifacts/registry")
+MODEL_RELOAD_INTERVAL_SECONDS = 60  # how often the API checks for a newly promoted version
+
+# Flood Zone Proximity Configuration
+FLOOD_PROXIMITY_SCALE_KM = 1.0  # flood_proximity_score = exp(-distance_km / scale)
+
+# Flood Zone Catalog Configuration (app/utils/zone_catalog.py)
+# One zone file per city, loaded on first use. The bbox (min_lon, min_lat,
+# max_lon, max_lat) routes points to their city without loading any zones;
+# cities whose file is missing have no zones (proximity score 0).
+FLOOD_ZONE_CATALOG = [
+    {"city": "Bengaluru", "path": "data/bangalore_flood_zones.kml", "bbox": (77.46, 12.83, 77.78, 13.14)},
+    {"city": "Mumbai", "path": "data/flood_zones/mumbai.kml", "bbox": (72.77, 18.89, 73.00, 19.28)},
+    {"city": "Delhi", "path": "data/flood_zones/delhi.kml", "bbox": (76.84, 28.40, 77.35, 28.88)},
+    {"city": "Chennai", "path": "data/flood_zones/chennai.kml", "bbox": (80.15, 12.90, 80.32, 13.24)},
+    {"city": "Kolkata", "path": "data/flood_zones/kolkata.kml", "bbox": (88.23, 22.45, 88.45, 22.65)},
+]
+FLOOD_ZONE_ROUTE_MARGIN_DEG = 0.05  # bbox padding (~5 km) so points just outside a city still see its zones
+# Least recently used cities are unloaded beyond either limit
+FLOOD_ZONE_MAX_LOADED_CITIES = int(os.getenv("FLOOD_ZONE_MAX_LOADED_CITIES", "3"))
+FLOOD_ZONE_MAX_LOADED_FEATURES = 200000  # zone features across loaded cities, a proxy for memory
+
+# Location Feature Store Configuration (build_feature_grid.py)
+FEATURE_STORE_PATH = os.getenv("FEATURE_STORE_PATH", "data/feature_store/grid.npy")
+# Used outside the grid, for cells without data, or when no grid is built
+FEATURE_STORE_DEFAULTS = {"Altitude": 900.0, "River_Level": 5.0}
 
 # Risk Assessment Configuration
 RISK_THRESHOLDS = {
@@ -47,6 +103,84 @@ RISK_THRESHOLDS = {
     "user_reports_high_risk": 5     # Trigger high risk if more than 5 reports are found
 }
 
+# Dashboard Configuration
+DASHBOARD_WINDOW_HOURS = 48  # default window when no start_time is given
+DASHBOARD_MAX_POINTS = 100  # newest reports returned as map points
+DASHBOARD_MAX_CLUSTERS = 500  # densest grid cells returned in cluster mode
+DASHBOARD_CLUSTER_CELLS_PER_TILE = 4  # grid cells per 256px map tile side (~64px clusters)
+DASHBOARD_DEFAULT_ZOOM = 12
+DASHBOARD_STATS_RETENTION_HOURS = 24 * 7  # hourly stat buckets kept for range queries
+DASHBOARD_STATS_REFRESH_SECONDS = 30  # re-read buckets so workers converge on each other's writes
+
+# Response Cache Configuration (app/utils/response_cache.py)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = 2000
+# Cached GET routes: TTL (also the Cache-Control max-age), the writes that
+# invalidate them, and query params rounded to N decimals before keying.
+RESPONSE_CACHE_ROUTES = {
+    "/risk": {"ttl": 60, "tags": ["reports"], "quantize": {"lat": 3, "lon": 3}},  # ~110 m cells
+    "/dashboard-data": {"ttl": 15, "tags": ["reports"]},
+    "/alerts/recent": {"ttl": 10, "tags": ["alerts"]},
+}
+
+# Listing & Export Configuration
+MAX_PAGE_SIZE = 200
+EXPORT_BATCH_SIZE = 1000  # documents per Motor batch / NDJSON chunk
+
+# Bulk Parquet Export Configuration (export_data.py)
+EXPORT_DIR = os.getenv("EXPORT_DIR", "data/exports")
+EXPORT_ROWS_PER_FILE = 50000
+
+# Vector Tile Configuration
+TILE_MAX_ZOOM = 22
+TILE_EXTENT = 4096  # MVT coordinate resolution per tile
+TILE_MAX_REPORTS = 5000  # newest reports encoded per tile
+TILE_CACHE_MAX_ENTRIES = 2048
+TILE_CACHE_TTL_SECONDS = 300  # bounds staleness as reports age out of the window
+
+# Alert Aggregation Configuration
+ALERT_DEDUP_WINDOW_MINUTES = int(os.getenv("ALERT_DEDUP_WINDOW_MINUTES", "60"))
+ALERT_AREA_PRECISION = 2  # decimal places of lat/lon per alert area (~1.1 km)
+# Per-process memory of claimed areas, so repeat reports skip MongoDB
+ALERT_AREA_CACHE_SECONDS = int(os.getenv("ALERT_AREA_CACHE_SECONDS", "60"))
+ALERT_AREA_CACHE_MAX_ENTRIES = 4096
+
+# Alert Streaming Configuration
+ALERT_STREAM_QUEUE_SIZE = 100  # per-client buffer; oldest alerts are dropped when full
+ALERT_STREAM_KEEPALIVE_SECONDS = 15
+# The API follows the alerts collection so its clients see alerts written by
+# worker.py and other API workers: by polling for new inserts, or through the
+# change stream (requires a replica set; falls back to polling) when enabled.
+ALERT_CHANGE_STREAM = os.getenv("ALERT_CHANGE_STREAM", "false").lower() == "true"
+ALERT_POLL_INTERVAL_SECONDS = float(os.getenv("ALERT_POLL_INTERVAL_SECONDS", "2"))
+ALERT_POLL_LOOKBACK_SECONDS = 30  # re-read window; covers clock skew between inserting hosts
+
+# Recent Alerts Buffer Configuration
+# Serves /alerts/recent from memory, kept current by following the alerts collection.
+RECENT_ALERTS_BUFFER_SIZE = 200
+
+# Background Job Queue Configuration (worker.py)
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))  # jobs in flight per worker process
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_SECONDS = 5  # doubled after every failed attempt
+JOB_LEASE_SECONDS = 120  # a running job whose worker died is picked up again after this
+JOB_POLL_INTERVAL_SECONDS = 1.0  # idle wait between empty claims
+JOB_RETENTION_HOURS = 24  # finished jobs are removed by a TTL index after this
+JOB_DEPTH_INTERVAL_SECONDS = 15  # how often the API refreshes queue-depth gauges
+
+# Metrics Configuration
+# Per-stage / per-request / per-Mongo-command latency on GET /metrics.
+# Off by default: /metrics is unauthenticated, so only enable it where the
+# API port is reachable from the scraper's network alone.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+
+# Tracing Configuration (optional OpenTelemetry packages, see app/utils/tracing.py)
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "otlp")  # "otlp" or "file"
+TRACING_FILE_PATH = os.getenv("TRACING_FILE_PATH", "logs/traces.jsonl")
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", "1.0"))  # share of requests traced
+TRACING_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "rainsafe-api")
+
 # Cron Configuration
 CRON_INTERVAL_MINUTES = 30
 CRON_SCRIPT_PATH = "scripts/run_weather_cron.sh"
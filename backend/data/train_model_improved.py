@@ -1,148 +1,358 @@
 """
 RainSafe - Improved RandomForest Model Training
 Target: >50% accuracy for now with Bangalore + Karnataka data
+
+Staged, resumable pipeline:
+  1. load      - static CSVs and/or Parquet exports (see export_data.py)
+  2. features  - raw feature matrix, cached as .npz keyed by a hash of the inputs; the
+                 engineered features come from app/models/feature_transform.py, fitted on
+                 the training split and saved in the model manifest for serving
+  3. search    - parallel successive-halving hyperparameter search, checkpointed per
+                 (data hash, grid); --search reuse refits the last best parameters
+  4. fit       - final model on the training split, evaluated and published as a new
+                 version in the model registry (app/models/model_registry.py)
+
+Re-running with unchanged inputs skips straight to the final fit.
 """
 
+import argparse
+import hashlib
+import json
 import os
-import pickle
+import sys
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
 from sklearn.metrics import accuracy_score, classification_report
-from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold, train_test_split
 from sklearn.preprocessing import StandardScaler
 
 # --- Project Paths ---
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 ML_ARTIFACTS_DIR = DATA_DIR / "ml-artifacts"
-ML_ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR = ML_ARTIFACTS_DIR / "cache"
 
 BLR_CSV = DATA_DIR / "bangalore_urban_flood_prediction.csv"
 INDIA_CSV = DATA_DIR / "flood_risk_dataset_india.csv"
+# Parquet written by `python export_data.py`
+EXPORT_DIR = PROJECT_ROOT / os.getenv("EXPORT_DIR", "data/exports")
+
+# "csv" (static datasets), "exports" (collected reports + weather) or "all"
+TRAINING_DATA = os.getenv("TRAINING_DATA", "all")
+
+sys.path.insert(0, str(PROJECT_ROOT))
+from app.models.feature_transform import MODEL_FEATURES, RAW_FEATURES, FeatureTransform  # noqa: E402
+from app.models.model_registry import ModelRegistry  # noqa: E402
+from app.utils.feature_store import FeatureStore  # noqa: E402
+from app.utils.zone_catalog import FloodZoneCatalog  # noqa: E402
+from config.settings import FEATURE_STORE_PATH, MODEL_REGISTRY_DIR, RISK_THRESHOLDS  # noqa: E402
+
+# Bump when feature engineering changes, so cached matrices are rebuilt.
+FEATURE_VERSION = 4
+
+# Same raster features the API samples for /risk (defaults where no grid is built)
+feature_store = FeatureStore(str(PROJECT_ROOT / FEATURE_STORE_PATH))
+# Same per-city zone catalog the API routes /risk points through
+flood_checker = FloodZoneCatalog(base_dir=PROJECT_ROOT)
+
+
+def add_flood_proximity(df: pd.DataFrame) -> pd.DataFrame:
+    """Same distance-to-nearest-zone score the API computes for /risk."""
+    df["flood_proximity_score"] = flood_checker.proximity_many(df["Latitude"].to_numpy(), df["Longitude"].to_numpy())
+    return df
+
+common_features = RAW_FEATURES + ["flood"]
 
-# --- Load Datasets ---
-blr_df = pd.read_csv(BLR_CSV)
-india_df = pd.read_csv(INDIA_CSV)
-
-# --- Flood proximity for Bangalore (set 0 for now) ---
-blr_df["flood_proximity_score"] = 0
-
-# --- Karnataka filter in India data ---
-india_df = india_df[
-    (india_df["Latitude"] >= 11)
-    & (india_df["Latitude"] <= 19)
-    & (india_df["Longitude"] >= 74)
-    & (india_df["Longitude"] <= 78)
-].copy()
-
-# --- Rename columns in India dataset to match BLR dataset ---
-india_df.rename(
-    columns={
-        "Rainfall (mm)": "Rainfall_Intensity",
-        "Elevation (m)": "Altitude",
-        "Humidity (%)": "Humidity",
-        "Water Level (m)": "River_Level",
-        "Temperature (°C)": "Temperature",
-        "Flood Occurred": "flood",
-    },
-    inplace=True,
-)
-india_df["flood_proximity_score"] = 0
-
-# --- Common features ---
-common_features = [
-    "Altitude",
-    "Rainfall_Intensity",
-    "Temperature",
-    "Humidity",
-    "River_Level",
-    "Latitude",
-    "Longitude",
-    "flood_proximity_score",
-    "flood",
-]
-
-blr_df = blr_df[common_features]
-india_df = india_df[common_features]
-
-# --- Combine datasets and shuffle ---
-combined_df = pd.concat([blr_df, india_df], ignore_index=True)
-combined_df = combined_df.sample(frac=1, random_state=42).reset_index(drop=True)
-
-print("Flood proximity stats (Bangalore only):")
-print(blr_df["flood_proximity_score"].describe())
-print(
-    f"✅ Training with {len(common_features)-1} features, {len(combined_df)} total rows.\n"
-)
-
-# --- Feature Engineering (optional) ---
-combined_df["rainfall_anomaly"] = (
-    combined_df["Rainfall_Intensity"] - combined_df["Rainfall_Intensity"].mean()
-)
-combined_df["is_monsoon"] = combined_df["Latitude"].apply(
-    lambda lat: 1 if 11 <= lat <= 19 else 0
-)
-
-# Update features list
-features = [f for f in common_features if f != "flood"]
-features += ["rainfall_anomaly", "is_monsoon"]
-
-# --- Split Features & Target ---
-X = combined_df[features]
-y = combined_df["flood"]
-
-# --- Train/Test Split ---
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-
-print("\nTrain class balance:", pd.Series(y_train).value_counts(normalize=True))
-print("Test class balance:", pd.Series(y_test).value_counts(normalize=True))
-
-# --- Scale Features ---
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-
-# --- Grid Search for Hyperparameters ---
 param_grid = {
     "n_estimators": [100, 200],
     "max_depth": [8, 12, 16],
     "min_samples_leaf": [2, 4],
     "class_weight": ["balanced", None],
 }
-cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-grid = GridSearchCV(
-    RandomForestClassifier(random_state=42, n_jobs=-1),
-    param_grid,
-    cv=cv,
-    scoring="accuracy",
-    n_jobs=-1,
-)
-grid.fit(X_train_scaled, y_train)
-print("\nBest parameters from grid search:", grid.best_params_)
-
-# --- Final Model ---
-model = grid.best_estimator_
-
-# --- Evaluate ---
-preds = model.predict(X_test_scaled)
-print(f"\n🧠 RandomForest Accuracy: {accuracy_score(y_test, preds):.3f}")
-print(classification_report(y_test, preds))
-
-# --- Feature Importances ---
-feature_importances = pd.Series(model.feature_importances_, index=X.columns)
-print("Feature importances:\n", feature_importances.sort_values(ascending=False))
-
-# --- Save Artifacts ---
-with open(ML_ARTIFACTS_DIR / "model.pkl", "wb") as f:
-    pickle.dump(model, f)
-with open(ML_ARTIFACTS_DIR / "scaler.pkl", "wb") as f:
-    pickle.dump(scaler, f)
-with open(ML_ARTIFACTS_DIR / "model_features.pkl", "wb") as f:
-    pickle.dump(list(X.columns), f)
-
-print("\n✅ Final model artifacts saved successfully.")
+
+
+# --- Stage 1: load ---
+
+
+def load_collected_data(export_dir: Path) -> pd.DataFrame:
+    """
+    Turn exported user reports into labelled training rows. Each report is
+    joined to the weather snapshot of its nearest city taken closest in time
+    (within 3 hours); reports at or above the HIGH water levels are floods.
+    """
+    reports_dir, weather_dir = export_dir / "reports", export_dir / "weather_data"
+    if not reports_dir.exists() or not weather_dir.exists():
+        return pd.DataFrame()
+
+    reports = pd.read_parquet(reports_dir, columns=["created_at", "latitude", "longitude", "water_level"])
+    weather = pd.read_parquet(
+        weather_dir, columns=["fetched_at", "city_name", "latitude", "longitude", "temp", "humidity", "rain_1h_mm"]
+    )
+    reports = reports.dropna(subset=["created_at", "latitude", "longitude"])
+    weather = weather.dropna(subset=["fetched_at", "city_name"])
+    if reports.empty or weather.empty:
+        return pd.DataFrame()
+
+    # Nearest weather city per report (vectorized over all reports x cities)
+    cities = weather.groupby("city_name")[["latitude", "longitude"]].mean()
+    d2 = (reports["latitude"].to_numpy()[:, None] - cities["latitude"].to_numpy()) ** 2 + (
+        reports["longitude"].to_numpy()[:, None] - cities["longitude"].to_numpy()
+    ) ** 2
+    reports["city_name"] = cities.index.to_numpy()[d2.argmin(axis=1)]
+
+    merged = pd.merge_asof(
+        reports.sort_values("created_at"),
+        weather.drop(columns=["latitude", "longitude"]).sort_values("fetched_at"),
+        left_on="created_at",
+        right_on="fetched_at",
+        by="city_name",
+        direction="nearest",
+        tolerance=pd.Timedelta(hours=3),
+    ).dropna(subset=["fetched_at"]).reset_index(drop=True)
+    location = feature_store.sample_many(merged["latitude"].to_numpy(), merged["longitude"].to_numpy())
+
+    return pd.DataFrame(
+        {
+            "Altitude": location["Altitude"],
+            "Rainfall_Intensity": merged["rain_1h_mm"].fillna(0.0),
+            "Temperature": merged["temp"],
+            "Humidity": merged["humidity"],
+            "River_Level": location["River_Level"],
+            "Latitude": merged["latitude"],
+            "Longitude": merged["longitude"],
+            "flood_proximity_score": flood_checker.proximity_many(
+                merged["latitude"].to_numpy(), merged["longitude"].to_numpy()
+            ),
+            "flood": merged["water_level"].isin(RISK_THRESHOLDS["HIGH_WATER_LEVEL"]).astype(int),
+        }
+    ).dropna()
+
+
+def load_csv_data() -> List[pd.DataFrame]:
+    blr_df = pd.read_csv(BLR_CSV)
+    india_df = pd.read_csv(INDIA_CSV)
+
+    # --- Karnataka filter in India data ---
+    india_df = india_df[
+        (india_df["Latitude"] >= 11)
+        & (india_df["Latitude"] <= 19)
+        & (india_df["Longitude"] >= 74)
+        & (india_df["Longitude"] <= 78)
+    ].copy()
+
+    # --- Rename columns in India dataset to match BLR dataset ---
+    india_df.rename(
+        columns={
+            "Rainfall (mm)": "Rainfall_Intensity",
+            "Elevation (m)": "Altitude",
+            "Humidity (%)": "Humidity",
+            "Water Level (m)": "River_Level",
+            "Temperature (°C)": "Temperature",
+            "Flood Occurred": "flood",
+        },
+        inplace=True,
+    )
+
+    return [add_flood_proximity(blr_df)[common_features], add_flood_proximity(india_df)[common_features]]
+
+
+def input_files(sources: str) -> List[Path]:
+    files: List[Path] = []
+    if sources in ("csv", "all"):
+        files += [BLR_CSV, INDIA_CSV]
+    files += [p for p in flood_checker.paths.values() if p.exists()]
+    if sources in ("exports", "all"):
+        files += sorted(p for sub in ("reports", "weather_data") for p in (EXPORT_DIR / sub).rglob("*.parquet"))
+        # Collected rows take their location features from the grid
+        files += [p for p in (feature_store.grid_path, feature_store.meta_path) if p.exists()]
+    return files
+
+
+def inputs_hash(sources: str) -> str:
+    """
+    Fingerprint of everything the feature matrix depends on. CSVs are hashed by
+    content; export parts are immutable once written and the feature grid is
+    large, so those are fingerprinted by name, size and mtime.
+    """
+    h = hashlib.sha256(f"features-v{FEATURE_VERSION}:{sources}".encode())
+    for path in input_files(sources):
+        if path.suffix != ".csv":
+            stat = path.stat()
+            h.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+# --- Stage 2: features ---
+
+
+def build_features(sources: str) -> Tuple[np.ndarray, np.ndarray]:
+    frames = load_csv_data() if sources in ("csv", "all") else []
+    if sources in ("exports", "all"):
+        collected_df = load_collected_data(EXPORT_DIR)
+        print(f"📦 Loaded {len(collected_df)} labelled rows from exports in {EXPORT_DIR}")
+        if not collected_df.empty:
+            frames.append(collected_df[common_features])
+    if not frames:
+        raise SystemExit("❌ No training data: run export_data.py or set TRAINING_DATA=csv")
+
+    # --- Combine datasets and shuffle ---
+    combined_df = pd.concat(frames, ignore_index=True)
+    combined_df = combined_df.sample(frac=1, random_state=42).reset_index(drop=True)
+    print(f"✅ Training with {len(MODEL_FEATURES)} features, {len(combined_df)} total rows.\n")
+
+    return combined_df[RAW_FEATURES].to_numpy(dtype=np.float64), combined_df["flood"].to_numpy()
+
+
+def load_or_build_features(sources: str, data_hash: str, force: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Raw (RAW_FEATURES-ordered) matrix and labels, from cache when the inputs are unchanged."""
+    cache_path = CACHE_DIR / f"features-{data_hash}.npz"
+    if cache_path.exists() and not force:
+        cached = np.load(cache_path, allow_pickle=False)
+        # Column names are stored as a plain string array so the cache loads without pickle.
+        if "columns" in cached and list(cached["columns"]) == RAW_FEATURES:
+            print(f"♻️ Reusing cached feature matrix {cache_path.name}")
+            return cached["X"], cached["y"]
+        print(f"⚠️ Cached feature matrix {cache_path.name} has different columns, rebuilding")
+
+    X, y = build_features(sources)
+    tmp_path = cache_path.with_suffix(".tmp.npz")
+    np.savez(tmp_path, X=X, y=y, columns=np.array(RAW_FEATURES, dtype=str))
+    tmp_path.replace(cache_path)
+    print(f"💾 Cached feature matrix as {cache_path.name}")
+    return X, y
+
+
+# --- Stage 3: search ---
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def search_params(X_train: np.ndarray, y_train: np.ndarray, data_hash: str, mode: str) -> Dict[str, Any]:
+    """
+    Best RandomForest parameters for this data. `mode`: "auto" reuses the
+    checkpoint for this (data, grid) if present, "full" always searches,
+    "reuse" refits the most recent best parameters without searching.
+    """
+    grid_hash = hashlib.sha256(json.dumps(param_grid, sort_keys=True).encode()).hexdigest()[:8]
+    checkpoint = CACHE_DIR / f"search-{data_hash}-{grid_hash}.json"
+    latest = CACHE_DIR / "search-latest.json"
+
+    if mode == "reuse" and latest.exists():
+        params = _read_json(latest)["best_params"]
+        print(f"♻️ Reusing last best parameters: {params}")
+        return params
+    if mode == "auto" and checkpoint.exists():
+        params = _read_json(checkpoint)["best_params"]
+        print(f"♻️ Search checkpoint found ({checkpoint.name}): {params}")
+        return params
+
+    # Successive halving: every combination gets a small sample first, and only
+    # the best third advances to three times as many samples each round.
+    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    grid = HalvingGridSearchCV(
+        RandomForestClassifier(random_state=42, n_jobs=1),
+        param_grid,
+        cv=cv,
+        factor=3,
+        resource="n_samples",
+        scoring="accuracy",
+        n_jobs=-1,
+        random_state=42,
+    )
+    grid.fit(X_train, y_train)
+    print("\nBest parameters from halving search:", grid.best_params_)
+
+    result = {"best_params": grid.best_params_, "best_score": float(grid.best_score_), "data_hash": data_hash}
+    _write_json(checkpoint, result)
+    _write_json(latest, result)
+    return grid.best_params_
+
+
+# --- Stage 4: fit, evaluate, save ---
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", choices=["csv", "exports", "all"], default=TRAINING_DATA)
+    parser.add_argument("--search", choices=["auto", "full", "reuse"], default="auto")
+    parser.add_argument("--rebuild-features", action="store_true", help="ignore the cached feature matrix")
+    parser.add_argument("--no-promote", action="store_true", help="publish the version without making it live")
+    args = parser.parse_args()
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    data_hash = inputs_hash(args.data)
+    print(f"🔑 Input hash: {data_hash}")
+    X, y = load_or_build_features(args.data, data_hash, args.rebuild_features)
+
+    # --- Train/Test Split ---
+    X_train_raw, X_test_raw, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+    print("\nTrain class balance:", pd.Series(y_train).value_counts(normalize=True))
+    print("Test class balance:", pd.Series(y_test).value_counts(normalize=True))
+
+    # --- Feature Engineering (same transform the API applies) ---
+    transform = FeatureTransform.fit(X_train_raw)
+    X_train = transform.transform(X_train_raw)
+    X_test = transform.transform(X_test_raw)
+
+    # --- Scale Features ---
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    best_params = search_params(X_train_scaled, y_train, data_hash, args.search)
+
+    # --- Final Model ---
+    model = RandomForestClassifier(random_state=42, n_jobs=-1, **best_params)
+    model.fit(X_train_scaled, y_train)
+
+    # --- Evaluate ---
+    preds = model.predict(X_test_scaled)
+    accuracy = accuracy_score(y_test, preds)
+    print(f"\n🧠 RandomForest Accuracy: {accuracy:.3f}")
+    print(classification_report(y_test, preds))
+
+    # --- Feature Importances ---
+    feature_importances = pd.Series(model.feature_importances_, index=transform.output_features)
+    print("Feature importances:\n", feature_importances.sort_values(ascending=False))
+
+    # --- Publish to the model registry (the API hot-swaps promoted versions) ---
+    registry = ModelRegistry(str(PROJECT_ROOT / MODEL_REGISTRY_DIR))
+    version = registry.publish(
+        model,
+        scaler,
+        transform.output_features,
+        metrics={"accuracy": float(accuracy), "test_rows": int(len(y_test)), "train_rows": int(len(y_train))},
+        extra={
+            "algorithm": "RandomForestClassifier",
+            "params": best_params,
+            "data_hash": data_hash,
+            "feature_transform": transform.to_dict(),
+        },
+        promote=not args.no_promote,
+    )
+
+    status = "published" if args.no_promote else "published and promoted"
+    print(f"\n✅ Model version {version} {status} in {registry.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Bulk export of MongoDB collections to partitioned Parquet for analytics and retraining.
+
+Streams `reports`, `alerts` and `weather_data` in batches into
+data/exports/<collection>/date=YYYY-MM-DD/part-*.parquet, keeping only the
+projected fields. A watermark per collection records the last exported
+document, so later runs only export what arrived since.
+
+    python export_data.py                      # incremental export of every collection
+    python export_data.py --collections reports --full
+
+Each collection has a fixed Arrow schema, so every file of a dataset agrees
+on column types however the documents happen to store them. A --full export
+rebuilds the collection's directory and replaces the old one when done.
+Malformed documents (no coordinates, unparseable timestamps) are skipped and
+counted rather than aborting the export.
+"""
+
+import argparse
+import json
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pymongo
+from bson import ObjectId
+
+from config.settings import DATABASE_NAME, EXPORT_DIR, EXPORT_ROWS_PER_FILE, MONGO_URI
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """weather_data stores fetched_at as an ISO string; reports/alerts as BSON dates."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _report_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc["_id"]),
+        "created_at": _as_datetime(doc.get("created_at")),
+        "latitude": doc.get("latitude"),
+        "longitude": doc.get("longitude"),
+        "water_level": doc.get("water_level"),
+        "description": doc.get("description"),
+    }
+
+
+def _alert_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc["_id"]),
+        "sent_at": _as_datetime(doc.get("sent_at")),
+        "location_name": doc.get("location_name"),
+        "risk_level": doc.get("risk_level"),
+        "source": doc.get("source"),
+        "message": doc.get("message"),
+    }
+
+
+def _weather_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    coords = (doc.get("coordinates") or {}).get("coordinates") or []
+    if len(coords) < 2:
+        raise ValueError("missing coordinates")
+    lon, lat = coords[:2]
+    current = doc.get("current_weather") or {}
+    return {
+        "id": str(doc["_id"]),
+        "fetched_at": _as_datetime(doc.get("fetched_at")),
+        "city_name": doc.get("city_name"),
+        "latitude": lat,
+        "longitude": lon,
+        "temp": current.get("temp"),
+        "humidity": current.get("humidity"),
+        "pressure": current.get("pressure"),
+        "wind_speed": current.get("wind_speed"),
+        "rain_1h_mm": current.get("rain_1h_mm"),
+        "weather_condition": current.get("weather_condition"),
+    }
+
+
+_TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+# Per collection: the field the watermark advances on, the Mongo projection
+# (forecast_data etc. are deliberately left out), the row builder and the
+# Parquet schema (numbers are always float64, so an integer temp in one file
+# and 25.5 in another, or an all-null column, still read as one dataset).
+EXPORT_SPECS: Dict[str, Dict[str, Any]] = {
+    "reports": {
+        "time_field": "created_at",
+        "projection": {"created_at": 1, "latitude": 1, "longitude": 1, "water_level": 1, "description": 1},
+        "row": _report_row,
+        "schema": pa.schema(
+            [
+                ("id", pa.string()),
+                ("created_at", _TIMESTAMP),
+                ("latitude", pa.float64()),
+                ("longitude", pa.float64()),
+                ("water_level", pa.string()),
+                ("description", pa.string()),
+            ]
+        ),
+    },
+    "alerts": {
+        "time_field": "sent_at",
+        "projection": {"sent_at": 1, "location_name": 1, "risk_level": 1, "source": 1, "message": 1},
+        "row": _alert_row,
+        "schema": pa.schema(
+            [
+                ("id", pa.string()),
+                ("sent_at", _TIMESTAMP),
+                ("location_name", pa.string()),
+                ("risk_level", pa.string()),
+                ("source", pa.string()),
+                ("message", pa.string()),
+            ]
+        ),
+    },
+    "weather_data": {
+        "time_field": "fetched_at",
+        "projection": {"fetched_at": 1, "city_name": 1, "coordinates": 1, "current_weather": 1},
+        "row": _weather_row,
+        "schema": pa.schema(
+            [
+                ("id", pa.string()),
+                ("fetched_at", _TIMESTAMP),
+                ("city_name", pa.string()),
+                ("latitude", pa.float64()),
+                ("longitude", pa.float64()),
+                ("temp", pa.float64()),
+                ("humidity", pa.float64()),
+                ("pressure", pa.float64()),
+                ("wind_speed", pa.float64()),
+                ("rain_1h_mm", pa.float64()),
+                ("weather_condition", pa.string()),
+            ]
+        ),
+    },
+}
+
+
+class Watermarks:
+    """Last exported (time, _id) per collection, persisted as JSON next to the exports."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._marks: Dict[str, Dict[str, Any]] = (
+            json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        )
+
+    def get(self, collection: str) -> Optional[Dict[str, Any]]:
+        return self._marks.get(collection)
+
+    def set(self, collection: str, raw_time: Any, doc_id: ObjectId) -> None:
+        self._marks[collection] = {
+            # Keep the stored type: weather_data compares ISO strings, the others dates.
+            "time": raw_time if isinstance(raw_time, str) else _as_datetime(raw_time).isoformat(),
+            "time_is_string": isinstance(raw_time, str),
+            "id": str(doc_id),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._marks, indent=2), encoding="utf-8")
+
+
+def _since_query(time_field: str, mark: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not mark:
+        return {}
+    ts = mark["time"] if mark.get("time_is_string") else datetime.fromisoformat(mark["time"])
+    return {"$or": [{time_field: {"$gt": ts}}, {time_field: ts, "_id": {"$gt": ObjectId(mark["id"])}}]}
+
+
+def _write_partition(dataset_dir: Path, rows: List[Dict[str, Any]], time_field: str, schema: pa.Schema) -> Path:
+    day = rows[0][time_field].strftime("%Y-%m-%d") if rows[0][time_field] else "unknown"
+    partition = dataset_dir / f"date={day}"
+    partition.mkdir(parents=True, exist_ok=True)
+    path = partition / f"part-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')}.parquet"
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), path, compression="zstd")
+    return path
+
+
+def export_collection(
+    db, collection: str, out_dir: Path, watermarks: Watermarks, batch_size: int, rows_per_file: int, full: bool
+) -> int:
+    """Stream one collection into day-partitioned Parquet files; returns rows written."""
+    spec = EXPORT_SPECS[collection]
+    time_field: str = spec["time_field"]
+    to_row: Callable[[Dict[str, Any]], Dict[str, Any]] = spec["row"]
+
+    schema: pa.Schema = spec["schema"]
+
+    dataset_dir = out_dir / collection
+    # A full export is staged next to the live dataset and swapped in at the
+    # end, so readers never see both copies (or a half-written one).
+    target_dir = out_dir / f".{collection}.full" if full else dataset_dir
+    if full:
+        shutil.rmtree(target_dir, ignore_errors=True)
+
+    query = {} if full else _since_query(time_field, watermarks.get(collection))
+    cursor = (
+        db[collection]
+        .find(query, spec["projection"])
+        .sort([(time_field, pymongo.ASCENDING), ("_id", pymongo.ASCENDING)])
+        .batch_size(batch_size)
+    )
+
+    rows: List[Dict[str, Any]] = []
+    last_doc: Optional[Dict[str, Any]] = None
+    written = skipped = 0
+
+    def flush():
+        nonlocal rows, written
+        if not rows:
+            return
+        path = _write_partition(target_dir, rows, time_field, schema)
+        written += len(rows)
+        # Advance only after the file is on disk, so an interrupted run resumes cleanly.
+        if not full:
+            watermarks.set(collection, last_doc[time_field], last_doc["_id"])
+        print(f"💾 {collection}: wrote {len(rows)} rows to {path}")
+        rows = []
+
+    for doc in cursor:
+        try:
+            row = to_row(doc)
+        except (ValueError, TypeError) as e:
+            skipped += 1
+            last_doc = doc
+            print(f"⚠️ {collection}: skipping malformed document {doc['_id']}: {e}")
+            continue
+        # Start a new file whenever the day partition changes.
+        if rows and rows[-1][time_field] and row[time_field] and rows[-1][time_field].date() != row[time_field].date():
+            flush()
+        rows.append(row)
+        last_doc = doc
+        if len(rows) >= rows_per_file:
+            flush()
+    flush()
+    if skipped:
+        print(f"⚠️ {collection}: skipped {skipped} malformed documents")
+
+    if full:
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+        if target_dir.exists():
+            target_dir.rename(dataset_dir)
+    # Past trailing skipped documents too, so they aren't re-read every run
+    if last_doc is not None:
+        watermarks.set(collection, last_doc[time_field], last_doc["_id"])
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collections", nargs="+", choices=list(EXPORT_SPECS), default=list(EXPORT_SPECS))
+    parser.add_argument("--output-dir", type=Path, default=Path(EXPORT_DIR))
+    parser.add_argument("--batch-size", type=int, default=1000, help="documents fetched per Mongo batch")
+    parser.add_argument("--rows-per-file", type=int, default=EXPORT_ROWS_PER_FILE)
+    parser.add_argument("--full", action="store_true", help="re-export everything, replacing the existing files")
+    args = parser.parse_args()
+
+    if not MONGO_URI:
+        print("❌ Error: MONGO_URI not found in .env file.")
+        return
+
+    client = pymongo.MongoClient(MONGO_URI, serverSelectionTimeoutMS=15000)
+    try:
+        db = client[DATABASE_NAME]
+        watermarks = Watermarks(args.output_dir / "_watermarks.json")
+        for collection in args.collections:
+            count = export_collection(
+                db, collection, args.output_dir, watermarks, args.batch_size, args.rows_per_file, args.full
+            )
+            print(f"✅ {collection}: {count} new rows exported")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
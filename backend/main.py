@@ -265,36 +265,72 @@ RainSafe Backend - Main Application (Refactored & Fixed)
 
 import asyncio
 import logging
+import secrets
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import motor.motor_asyncio
+import orjson
 from dotenv import load_dotenv
-from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Query, Request, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 from app.models.flood_predictor import FloodPredictor
+from app.models.model_registry import model_manager
 from app.models.schemas import (
     Alert,
+    AlertPage,
     AssessmentSource,
+    MapCluster,
     MapPoint,
     PredictionResult,
     Report,
     ReportCreate,
+    ReportPage,
     ReportResponse,
     RiskAssessmentDetails,
     RiskLevel,
     RiskResponse,
-    WaterLevel,
 )
+from app.services.alert_aggregator import alert_aggregator
+from app.services.alert_bus import alert_bus
+from app.services.alert_service import alert_payload
+from app.services.dashboard_stats import breakdown, dashboard_stats
+from app.services.dashboard_service import (
+    bbox_match,
+    cluster_pipeline,
+    dashboard_pipeline,
+    empty_stats,
+    parse_bbox,
+)
+from app.services.job_queue import job_queue
+from app.services.recent_alerts import recent_alerts, validate_alert_docs
 from app.services.risk_service import RiskAssessmentService
+from app.services.vector_tiles import VectorTileService
 from app.utils.database import db
-from app.utils.geocoder import reverse_geocode
-from config.settings import RISK_THRESHOLDS, OPENWEATHER_API_KEY
-
-predictor = FloodPredictor()
+from app.utils.metrics import metrics
+from app.utils.tracing import setup_tracing
+from app.utils.zone_catalog import zone_catalog
+from app.utils.pagination import fetch_page, stream_ndjson, time_range_query
+from app.utils.response_cache import ResponseCacheMiddleware, response_cache
+from config.settings import (
+    ADMIN_TOKEN,
+    ALERT_STREAM_KEEPALIVE_SECONDS,
+    DASHBOARD_DEFAULT_ZOOM,
+    DASHBOARD_MAX_CLUSTERS,
+    DASHBOARD_MAX_POINTS,
+    DASHBOARD_WINDOW_HOURS,
+    EXPORT_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    RESPONSE_CACHE_ENABLED,
+    RISK_THRESHOLDS,
+    OPENWEATHER_API_KEY,
+    TILE_MAX_ZOOM,
+)
 
 # --- Logging ---
 logging.basicConfig(level=logging.INFO)
@@ -313,6 +349,17 @@ class DashboardStats(BaseModel):
 class DashboardResponse(BaseModel):
     map_points: List[MapPoint]
     stats: DashboardStats
+    clusters: Optional[List[MapCluster]] = None
+
+
+# --- Alert payloads ---
+def alert_payload_from_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
+    doc["_id"] = str(doc["_id"])
+    return alert_payload(Alert(**doc))
+
+
+# --- Vector tiles ---
+tile_service = VectorTileService(db, zone_catalog)
 
 
 # --- Dependency Injection ---
@@ -320,6 +367,14 @@ def get_risk_service(predictor: Optional[FloodPredictor] = None) -> RiskAssessme
     return RiskAssessmentService(database=db, predictor=predictor)
 
 
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Admin-only routes need X-Admin-Token; they are disabled while ADMIN_TOKEN is unset."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
 # --- Lifespan ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -328,14 +383,47 @@ async def lifespan(app: FastAPI):
         raise RuntimeError("Failed to connect to MongoDB during startup.")
 
     try:
-        app.state.predictor = FloodPredictor()
-        logger.info("✅ ML predictor initialized.")
+        await db.ensure_indexes()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not ensure MongoDB indexes: {e}")
+
+    try:
+        await model_manager.start()
+        if model_manager.predictor:
+            logger.info(f"✅ ML predictor initialized (version: {model_manager.version or 'fallback artifacts'}).")
     except Exception as e:
         logger.warning(f"⚠️ ML predictor failed to initialize: {e}")
-        app.state.predictor = None
+    model_watch_task = asyncio.create_task(model_manager.watch())
+
+    try:
+        await dashboard_stats.refresh()
+    except Exception as e:
+        logger.warning(f"⚠️ Dashboard stats not loaded, will retry on first request: {e}")
+
+    alert_bus.add_listener(recent_alerts.add)
+    alert_bus.add_listener(lambda alert: response_cache.invalidate("alerts"))
+    # Alerts are inserted by worker.py, so follow the collection rather than only this
+    # process's writes. Following starts from before the warm-up read and skips the
+    # alerts it returned, so an insert landing in between is neither lost nor doubled.
+    alerts = db.get_collection("alerts")
+    follow_from = await alert_bus.start_point(db.database)
+    warmed_ids: List[str] = []
+    try:
+        warmed_ids = await recent_alerts.warm(alerts)
+    except Exception as e:
+        logger.warning(f"⚠️ Recent alerts buffer not warmed, serving from MongoDB: {e}")
+    alerts_follow_task = asyncio.create_task(
+        alert_bus.follow(alerts, alert_payload_from_doc, seen_ids=warmed_ids, start_at=follow_from)
+    )
+
+    job_depth_task = asyncio.create_task(job_queue.watch_depth()) if metrics.enabled else None
 
     yield
     logger.info("🛑 Shutting down RainSafe API...")
+    model_watch_task.cancel()
+    if job_depth_task:
+        job_depth_task.cancel()
+    alerts_follow_task.cancel()
     await db.disconnect()
 
 
@@ -344,8 +432,15 @@ app = FastAPI(
     title="RainSafe API",
     version="1.2.0",
     description="A scalable and testable API for flood risk assessment.",
+    # orjson encodes response bodies several times faster than the stdlib encoder
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
+setup_tracing(app)
+
+if RESPONSE_CACHE_ENABLED:
+    # Added before CORS so cached responses still get CORS headers.
+    app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
 
 app.add_middleware(
     CORSMiddleware,
@@ -356,48 +451,25 @@ app.add_middleware(
 )
 
 
-# --- Helper: generate alert ---
-async def generate_alert(lat: float, lon: float, risk_level: RiskLevel, description: str) -> Optional[Alert]:
-    location_name = await reverse_geocode(lat, lon)
+if metrics.enabled:
 
-    if risk_level == RiskLevel.HIGH:
-        message = f"Severe Flood Warning in {location_name}: {description}. Immediate action advised."
-    elif risk_level == RiskLevel.MEDIUM:
-        message = f"Moderate Flood Risk in {location_name}: {description}. Exercise caution."
-    else:
-        message = f"Flood Warning: {description}. Risk Level: {risk_level.value}."
-
-    alert_record = {
-        "location_name": location_name,
-        "risk_level": risk_level,
-        "message": message,
-        "recipient": "all-subscribers-in-area",
-        "source": AssessmentSource.HYBRID_HISTORICAL,
-        "sent_at": datetime.now(timezone.utc),
-    }
-
-    try:
-        collection = db.get_collection("alerts")
-        result = await collection.insert_one(alert_record)
-        alert_record["_id"] = str(result.inserted_id)
-        logger.info(f"✅ Alert generated: {message}")
-        return Alert(**alert_record)
-    except Exception as e:
-        logger.error(f"❌ Error saving alert: {e}")
-        return None
-
-
-# --- Background task ---
-async def assess_and_alert_task(
-    lat: float, lon: float, description: str, predictor: Optional[FloodPredictor] = None
-):
-    risk_service = RiskAssessmentService(database=db, predictor=predictor)
-    try:
-        prediction = await risk_service.get_risk_prediction(lat=lat, lon=lon)
-        if prediction.final_risk in [RiskLevel.MEDIUM, RiskLevel.HIGH]:
-            await generate_alert(lat, lon, prediction.final_risk, description)
-    except Exception as e:
-        logger.error(f"❌ Background risk assessment failed: {e}")
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        start = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            # Label by route template (/tiles/{z}/{x}/{y}.mvt), not the raw path.
+            route = request.scope.get("route")
+            metrics.http_seconds.observe(
+                time.perf_counter() - start,
+                request.method,
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
 
 
 # --- API Endpoints ---
@@ -406,8 +478,16 @@ def read_root():
     return {"status": "RainSafe API is running!"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus text exposition of stage, request and MongoDB latencies."""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS_ENABLED=false)")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/report", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
-async def create_report(report: ReportCreate, background_tasks: BackgroundTasks, request: Request):
+async def create_report(report: ReportCreate, request: Request):
     try:
         report_data = report.model_dump(by_alias=True)
         report_data["created_at"] = datetime.now(timezone.utc)
@@ -416,14 +496,16 @@ async def create_report(report: ReportCreate, background_tasks: BackgroundTasks,
         result = await reports_collection.insert_one(report_data)
         created_doc = await reports_collection.find_one({"_id": result.inserted_id})
         created_doc["_id"] = str(created_doc["_id"])
-
-        # Background task
-        background_tasks.add_task(
-            assess_and_alert_task,
-            lat=report.latitude,
-            lon=report.longitude,
-            description=report.description,
-            predictor=request.app.state.predictor
+        tile_service.invalidate_report(report.latitude, report.longitude)
+        await dashboard_stats.record(report_data)
+        response_cache.invalidate("reports")
+
+        # Assessment and alerting run in worker.py; reports for an area that
+        # already has an assessment waiting share it.
+        await job_queue.enqueue(
+            "assess_and_alert",
+            {"lat": report.latitude, "lon": report.longitude, "description": report.description},
+            dedup_key=alert_aggregator.area_key(report.latitude, report.longitude),
         )
 
         return ReportResponse(message="Report received and analyzed successfully!", data=Report(**created_doc))
@@ -431,10 +513,44 @@ async def create_report(report: ReportCreate, background_tasks: BackgroundTasks,
         raise HTTPException(status_code=500, detail=f"Error creating report: {e}")
 
 
+@app.get("/reports", response_model=ReportPage)
+async def list_reports(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+):
+    """Pages through reports newest first using a created_at/_id keyset cursor."""
+    query = time_range_query("created_at", start_time, end_time)
+    try:
+        docs, next_cursor = await fetch_page(db.get_collection("reports"), query, "created_at", limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list reports: {e}")
+
+    items = []
+    for doc in docs:
+        try:
+            doc["_id"] = str(doc["_id"])
+            items.append(Report(**doc))
+        except Exception as validation_e:
+            logger.warning(f"⚠️ Document failed Report model validation and was skipped: {validation_e}, Data: {doc}")
+    return ReportPage(items=items, next_cursor=next_cursor)
+
+
+@app.get("/reports/export.ndjson")
+async def export_reports(start_time: Optional[datetime] = Query(None), end_time: Optional[datetime] = Query(None)):
+    """Streams every report in the range as newline-delimited JSON, in constant memory."""
+    query = time_range_query("created_at", start_time, end_time)
+    cursor = db.get_collection("reports").find(query).sort("created_at", 1)
+    return StreamingResponse(stream_ndjson(cursor, EXPORT_BATCH_SIZE), media_type="application/x-ndjson")
+
+
 @app.get("/risk", response_model=RiskResponse)
-async def get_risk(lat: float, lon: float, request: Request):
+async def get_risk(lat: float, lon: float, request: Request, response: Response):
     try:
-        risk_service = RiskAssessmentService(database=db, predictor=request.app.state.predictor)
+        risk_service = RiskAssessmentService(database=db, predictor=model_manager.predictor)
         prediction = await risk_service.get_risk_prediction(lat=lat, lon=lon)
         return RiskResponse(
             risk_level=prediction.final_risk,
@@ -442,6 +558,8 @@ async def get_risk(lat: float, lon: float, request: Request):
             details=RiskAssessmentDetails(**prediction.model_dump()),
         )
     except Exception as e:
+        # Don't let the response cache (or browsers) keep the error answer.
+        response.headers["Cache-Control"] = "no-store"
         return RiskResponse(
             risk_level=RiskLevel.UNKNOWN,
             source=AssessmentSource.ERROR,
@@ -457,76 +575,127 @@ async def get_risk(lat: float, lon: float, request: Request):
         )
 
 
+@app.get("/model")
+async def get_model_status():
+    """Live model version and the versions available in the registry."""
+    return model_manager.status()
+
+
+@app.post("/model/reload", dependencies=[Depends(require_admin)])
+async def reload_model():
+    """Check the registry now instead of waiting for the next poll."""
+    switched = await model_manager.reload()
+    return {"switched": switched, **model_manager.status()}
+
+
 @app.get("/dashboard-data", response_model=DashboardResponse)
-async def get_dashboard_data(start_time: Optional[datetime] = Query(None), end_time: Optional[datetime] = Query(None)):
+async def get_dashboard_data(
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    bbox: Optional[str] = Query(None, description="min_lon,min_lat,max_lon,max_lat of the visible map"),
+    zoom: int = Query(DASHBOARD_DEFAULT_ZOOM, ge=0, le=22, description="Map zoom level used for cluster size"),
+    cluster: bool = Query(False, description="Return grid clusters instead of individual map points"),
+):
+    try:
+        bounds = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
     try:
         collection = db.get_collection("reports")
         query = {}
-        effective_start = start_time or (datetime.now(timezone.utc) - timedelta(hours=48))
+        effective_start = start_time or (datetime.now(timezone.utc) - timedelta(hours=DASHBOARD_WINDOW_HOURS))
         query["created_at"] = {"$gte": effective_start}
         if end_time:
             query["created_at"]["$lte"] = end_time
-
-        recent_reports = await collection.find(query).sort("created_at", -1).limit(100).to_list(length=100)
-
-        map_points, high_risk, medium_risk = [], 0, 0
-        for doc in recent_reports:
-            water_level = doc.get("water_level")
-            risk = RiskLevel.LOW
-            if water_level in [WaterLevel.KNEE_DEEP, WaterLevel.WAIST_DEEP, WaterLevel.CHEST_DEEP, WaterLevel.ABOVE_HEAD]:
-                risk = RiskLevel.HIGH
-                high_risk += 1
-            elif water_level == WaterLevel.ANKLE_DEEP:
-                risk = RiskLevel.MEDIUM
-                medium_risk += 1
-
-            map_points.append(MapPoint(
-                id=str(doc["_id"]),
-                latitude=doc["latitude"],
-                longitude=doc["longitude"],
-                risk_level=risk,
-                source=AssessmentSource.USER_REPORT,
-                details=doc["description"]
-            ))
-
-        stats = DashboardStats(total_reports=len(recent_reports), high_risk_count=high_risk, medium_risk_count=medium_risk)
-        return DashboardResponse(map_points=map_points, stats=stats)
+        if bounds:
+            query.update(bbox_match(bounds))
+
+        # The pipelines project documents straight into the MapPoint / MapCluster /
+        # DashboardStats shapes, so the results are encoded as-is instead of being
+        # built into models and validated again against response_model.
+        if cluster:
+            cursor = collection.aggregate(cluster_pipeline(query, zoom, DASHBOARD_MAX_CLUSTERS), allowDiskUse=True)
+            result = (await cursor.to_list(length=1))[0]
+            stats = result["stats"][0] if result["stats"] else empty_stats()
+            return ORJSONResponse({"map_points": [], "stats": stats, "clusters": result["clusters"]})
+
+        # City-wide stats come from the hourly buckets; a bbox or a window older
+        # than their retention falls back to counting in the aggregation.
+        stats = None
+        if not bounds and dashboard_stats.covers(effective_start):
+            try:
+                totals = breakdown(await dashboard_stats.summarize(effective_start, end_time))
+                stats = {k: totals[k] for k in DashboardStats.model_fields}
+            except Exception as e:
+                logger.warning(f"⚠️ Dashboard stats buckets unavailable, counting reports instead: {e}")
+
+        # Classification runs in MongoDB and only the newest DASHBOARD_MAX_POINTS
+        # projected points come back.
+        pipeline = dashboard_pipeline(query, DASHBOARD_MAX_POINTS, include_stats=stats is None)
+        cursor = collection.aggregate(pipeline, allowDiskUse=True)
+        if stats is None:
+            result = (await cursor.to_list(length=1))[0]
+            stats = result["stats"][0] if result["stats"] else empty_stats()
+            map_points = result["map_points"]
+        else:
+            map_points = await cursor.to_list(length=DASHBOARD_MAX_POINTS)
+        return ORJSONResponse({"map_points": map_points, "stats": stats, "clusters": None})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get dashboard data: {e}")
 
 
+@app.get("/dashboard-stats")
+async def get_dashboard_stats(start_time: Optional[datetime] = Query(None), end_time: Optional[datetime] = Query(None)):
+    """Report counts by water level and risk level for a time range (hourly buckets plus exact edge hours)."""
+    effective_start = start_time or (datetime.now(timezone.utc) - timedelta(hours=DASHBOARD_WINDOW_HOURS))
+    if not dashboard_stats.covers(effective_start):
+        raise HTTPException(status_code=422, detail="start_time is older than the stats retention window")
+    try:
+        totals = await dashboard_stats.summarize(effective_start, end_time)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get dashboard stats: {e}")
+    return {"start_time": effective_start, "end_time": end_time, **breakdown(totals)}
+
+
+@app.get("/tiles/{z}/{x}/{y}.mvt")
+async def get_vector_tile(z: int, x: int, y: int):
+    """Mapbox Vector Tile with `reports` (recent reports) and `flood_zones` layers."""
+    if not 0 <= z <= TILE_MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+    try:
+        tile = await tile_service.get_tile(z, x, y)
+    except Exception as e:
+        logger.error(f"❌ Error building tile {z}/{x}/{y}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to build tile: {e}")
+    return Response(content=tile, media_type="application/vnd.mapbox-vector-tile")
+
+
 # --- CORRECTED ALERT ENDPOINTS ---
 
 @app.get("/alerts/recent", response_model=List[Alert])
-async def get_recent_alerts(limit: int = 50):
+async def get_recent_alerts(request: Request, limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE)):
     """
     Retrieves the most recent flood alerts for the dashboard.
-    Includes error handling to skip malformed documents, fixing the 500 error.
+    Served from the in-memory recent alerts buffer as pre-encoded JSON with an
+    ETag; falls back to MongoDB (skipping malformed documents) when the buffer
+    can't answer.
     """
+    if recent_alerts.can_serve(limit):
+        body, etag = recent_alerts.encoded(limit)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
     collection = db.get_collection("alerts")
     if collection is None:
         raise HTTPException(status_code=500, detail="Alerts collection not initialized")
-    
-    validated_alerts = []
-    
+
     try:
         # Fetch raw documents from MongoDB
         raw_alerts = await collection.find().sort("sent_at", -1).limit(limit).to_list(length=limit)
-
-        # Iterate and validate each document
-        for doc in raw_alerts:
-            try:
-                # Convert MongoDB's _id to string for Pydantic model
-                doc["_id"] = str(doc["_id"])
-                
-                # Pydantic validation: ensures data matches the Alert schema
-                validated_alerts.append(Alert(**doc))
-            except Exception as validation_e:
-                # Log documents that fail validation but continue processing others
-                logger.warning(f"⚠️ Document failed Alert model validation and was skipped: {validation_e}, Data: {doc}")
-                continue
-                
-        return validated_alerts
+        # Validated once here; returning a response skips re-validation against response_model.
+        return ORJSONResponse(validate_alert_docs(raw_alerts))
     except Exception as e:
         logger.error(f"❌ Critical error fetching/processing alerts: {e}")
         raise HTTPException(status_code=500, detail=f"Internal Server Error while fetching alerts: {e}")
@@ -549,10 +718,84 @@ async def create_new_alert(new_alert: Alert):
         inserted = await collection.find_one({"_id": result.inserted_id})
         inserted["_id"] = str(inserted["_id"])
         logger.info(f"✅ Alert inserted: {inserted['message']}")
-        
-        return Alert(**inserted)
+
+        alert = Alert(**inserted)
+        alert_bus.announce(alert_payload(alert))
+        return alert
     except Exception as e:
         logger.error(f"❌ Error in /alerts endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
 
+
+@app.get("/alerts", response_model=AlertPage)
+async def list_alerts(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+):
+    """Pages through alerts newest first using a sent_at/_id keyset cursor."""
+    query = time_range_query("sent_at", start_time, end_time)
+    try:
+        docs, next_cursor = await fetch_page(db.get_collection("alerts"), query, "sent_at", limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list alerts: {e}")
+    return AlertPage(items=validate_alert_docs(docs), next_cursor=next_cursor)
+
+
+@app.get("/alerts/export.ndjson")
+async def export_alerts(start_time: Optional[datetime] = Query(None), end_time: Optional[datetime] = Query(None)):
+    """Streams every alert in the range as newline-delimited JSON, in constant memory."""
+    query = time_range_query("sent_at", start_time, end_time)
+    cursor = db.get_collection("alerts").find(query).sort("sent_at", 1)
+    return StreamingResponse(stream_ndjson(cursor, EXPORT_BATCH_SIZE), media_type="application/x-ndjson")
+
+
+@app.websocket("/alerts/ws")
+async def alerts_websocket(websocket: WebSocket):
+    """Pushes each new alert to the client as a JSON message."""
+    await websocket.accept()
+    queue = alert_bus.subscribe()
+
+    async def forward_alerts():
+        while True:
+            await websocket.send_json(await queue.get())
+
+    sender = asyncio.create_task(forward_alerts())
+    try:
+        # Incoming messages are ignored; receiving is how the disconnect is noticed.
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        alert_bus.unsubscribe(queue)
+
+
+@app.get("/alerts/stream")
+async def alerts_event_stream(request: Request):
+    """Server-Sent Events feed of new alerts (`event: alert`), with periodic keepalives."""
+    queue = alert_bus.subscribe()
+
+    async def event_source():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    alert = await asyncio.wait_for(queue.get(), timeout=ALERT_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: alert\ndata: {orjson.dumps(alert).decode()}\n\n"
+        finally:
+            alert_bus.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # --- END CORRECTED ALERT ENDPOINTS ---
\ No newline at end of file
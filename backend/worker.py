@@ -0,0 +1,158 @@
+"""
+RainSafe - background job worker
+
+Runs the jobs the API enqueues (app/services/job_queue.py) outside the web
+processes: each worker process runs `--concurrency` consumers that claim jobs
+from MongoDB, so work survives API restarts and scales by starting more
+workers. Run from the backend directory:
+
+    python worker.py                                   # JOB_WORKER_CONCURRENCY consumers
+    python worker.py --concurrency 8 --metrics-port 9101
+
+Alerts written here reach the API's WebSocket/SSE clients and /alerts/recent
+through the API following the alerts collection (polling by default, or the
+change stream with ALERT_CHANGE_STREAM=true). Alert areas are claimed in
+MongoDB, so any number of workers coalesce alerts as one.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.models.model_registry import model_manager
+from app.services.alert_service import assess_and_alert
+from app.services.job_queue import job_queue, jobs_processed
+from app.utils.database import db
+from app.utils.metrics import metrics, timed
+from app.utils.tracing import background_span, extract_context, setup_tracing
+from config.settings import JOB_POLL_INTERVAL_SECONDS, JOB_WORKER_CONCURRENCY
+
+
+async def handle_assess_and_alert(job: Dict[str, Any]) -> None:
+    payload = job["payload"]
+    await assess_and_alert(
+        lat=payload["lat"],
+        lon=payload["lon"],
+        description=payload["description"],
+        # A retried job keeps its claim on the alert area.
+        claim_owner=str(job["_id"]),
+        predictor=model_manager.predictor,
+    )
+
+
+# job kind -> handler (called with the claimed job); a handler raising marks the attempt failed.
+HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {
+    "assess_and_alert": handle_assess_and_alert,
+}
+
+
+async def process(job: Dict[str, Any]) -> None:
+    kind = job["kind"]
+    if job["attempts"] > job_queue.max_attempts:
+        # Claimed again after its lease expired too often (the worker keeps dying on it).
+        await job_queue.fail(job, "lease expired on every attempt")
+        jobs_processed.inc(kind, "failed")
+        return
+    handler = HANDLERS.get(kind)
+    try:
+        if handler is None:
+            raise LookupError(f"no handler for job kind {kind!r}")
+        # Continue the trace of the request that enqueued the job.
+        with background_span(f"job.{kind}", extract_context(job.get("trace"))), timed(f"job.{kind}"):
+            await handler(job)
+    except Exception as e:
+        retry = await job_queue.fail(job, repr(e))
+        jobs_processed.inc(kind, "retry" if retry else "failed")
+        print(f"❌ Job {job['_id']} ({kind}) attempt {job['attempts']} failed{'' if retry else ' permanently'}: {e}")
+        return
+    await job_queue.complete(job)
+    jobs_processed.inc(kind, "done")
+
+
+async def consume(worker_id: str, stop: asyncio.Event) -> None:
+    """Claim and run jobs one at a time until `stop` is set."""
+    while not stop.is_set():
+        try:
+            job = await job_queue.claim(worker_id)
+        except Exception as e:
+            print(f"⚠️ {worker_id}: could not claim a job: {e}")
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await process(job)
+
+
+async def serve_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Minimal HTTP endpoint answering every request with the Prometheus text."""
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+        body = metrics.render().encode("utf-8")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body
+        )
+        await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run(concurrency: int, metrics_port: Optional[int]) -> None:
+    if not await db.connect():
+        raise SystemExit("❌ Failed to connect to MongoDB")
+    # The worker may start before the API; the queue and alert area indexes must exist either way.
+    try:
+        await db.ensure_indexes()
+    except Exception as e:
+        print(f"⚠️ Could not ensure MongoDB indexes: {e}")
+    try:
+        await model_manager.start()
+    except Exception as e:
+        print(f"⚠️ ML predictor failed to initialize, assessing with thresholds only: {e}")
+    model_watch_task = asyncio.create_task(model_manager.watch())
+
+    metrics_server = None
+    if metrics_port:
+        metrics_server = await asyncio.start_server(serve_metrics, "0.0.0.0", metrics_port)
+        print(f"📈 Worker metrics on :{metrics_port}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"👷 Worker {prefix} running {concurrency} consumers")
+    # Consumers finish the job in hand before exiting.
+    await asyncio.gather(*(consume(f"{prefix}:{i}", stop) for i in range(concurrency)))
+
+    print("🛑 Worker stopped")
+    model_watch_task.cancel()
+    if metrics_server:
+        metrics_server.close()
+    await db.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY, help="jobs run at once")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    args = parser.parse_args()
+
+    # Alert generation logs through the RainSafe logger, as it does in the API.
+    logging.basicConfig(level=logging.INFO)
+    setup_tracing()
+    asyncio.run(run(args.concurrency, args.metrics_port))
+
+
+if __name__ == "__main__":
+    main()
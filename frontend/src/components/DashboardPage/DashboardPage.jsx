@@ -80,28 +80,19 @@ const DashboardPage = () => {
     setError(null);
 
     try {
-      const [dashboardRes, alertsRes] = await Promise.all([
-        fetch('http://localhost:8000/dashboard-data', { signal: controller.signal }),
-        fetch('http://localhost:8000/alerts/recent', { signal: controller.signal })
-      ]);
+      const dashboardRes = await fetch('http://localhost:8000/dashboard-data', { signal: controller.signal });
 
       if (!dashboardRes.ok) {
         const text = await dashboardRes.text().catch(() => '');
         throw new Error(`Dashboard fetch failed: HTTP ${dashboardRes.status} ${dashboardRes.statusText} ${text ? `- ${text}` : ''}`);
       }
-      if (!alertsRes.ok) {
-        const text = await alertsRes.text().catch(() => '');
-        throw new Error(`Alerts fetch failed: HTTP ${alertsRes.status} ${alertsRes.statusText} ${text ? `- ${text}` : ''}`);
-      }
 
       const dashboardPayload = await dashboardRes.json();
-      const alertsPayload = await alertsRes.json();
 
       setData({
         map_points: Array.isArray(dashboardPayload.map_points) ? dashboardPayload.map_points : [],
         stats: dashboardPayload.stats ?? { total_reports: 0, high_risk_count: 0, medium_risk_count: 0 },
       });
-      setAlerts(Array.isArray(alertsPayload) ? alertsPayload : []);
 
     } catch (err) {
       if (err.name !== 'AbortError') {
@@ -127,6 +118,38 @@ const DashboardPage = () => {
     };
   }, [fetchData]);
 
+  // Alerts: load the recent list once, then receive new ones over Server-Sent Events
+  useEffect(() => {
+    const controller = new AbortController();
+
+    fetch('http://localhost:8000/alerts/recent', { signal: controller.signal })
+      .then(async (res) => {
+        if (!res.ok) {
+          const text = await res.text().catch(() => '');
+          throw new Error(`Alerts fetch failed: HTTP ${res.status} ${res.statusText} ${text ? `- ${text}` : ''}`);
+        }
+        return res.json();
+      })
+      .then((payload) => setAlerts(Array.isArray(payload) ? payload : []))
+      .catch((err) => {
+        if (err.name !== 'AbortError') {
+          console.error('Failed to fetch alerts:', err);
+          setError(err.message || 'Failed to fetch alerts');
+        }
+      });
+
+    const source = new EventSource('http://localhost:8000/alerts/stream');
+    source.addEventListener('alert', (event) => {
+      const alert = JSON.parse(event.data);
+      setAlerts((prev) => [alert, ...prev.filter((a) => a._id !== alert._id)].slice(0, 50));
+    });
+
+    return () => {
+      source.close();
+      controller.abort();
+    };
+  }, []);
+
   const { map_points, stats } = data;
   const totalReports = stats.total_reports;
   const highRiskCount = stats.high_risk_count;
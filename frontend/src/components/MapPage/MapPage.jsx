@@ -1,19 +1,18 @@
 import * as React from 'react';
-import { useState, useEffect } from 'react';
 import MapGL, { Source, Layer } from 'react-map-gl/mapbox';
 
 const MAPBOX_TOKEN = import.meta.env.VITE_MAPBOX_TOKEN;
 const PAGE_BG_COLOR = '#FFFAED'; // Defined the requested background color
+const TILES_URL = 'http://localhost:8000/tiles/{z}/{x}/{y}.mvt';
 
 // Define the heatmap layer style
 const heatmapLayer = {
   id: 'risk-heatmap',
   type: 'heatmap',
+  'source-layer': 'reports',
   paint: {
-    // Weight points based on a property, e.g., 'risk_level' converted to a numeric value
-    // For simplicity, we'll just use a uniform weight for all points in this layer definition.
-    // To apply different weights based on risk_level, you'd need a numerical 'weight' property in the GeoJSON.
-    'heatmap-weight': 1,
+    // Weight reports by their risk level
+    'heatmap-weight': ['match', ['get', 'risk_level'], 'High', 3, 'Medium', 2, 1],
     'heatmap-intensity': ['interpolate', ['linear'], ['zoom'], 0, 1, 9, 3],
     'heatmap-color': [
       'interpolate',
@@ -31,63 +30,21 @@ const heatmapLayer = {
   }
 };
 
-const MapPage = () => {
-  const [mapData, setMapData] = useState(null);
-  const [error, setError] = useState(null);
-
-  // Function to convert the flat array of points to GeoJSON FeatureCollection
-  const pointsToGeoJSON = (points) => {
-    if (!points || points.length === 0) {
-      return { type: 'FeatureCollection', features: [] };
-    }
-
-    return {
-      type: 'FeatureCollection',
-      features: points.map(point => ({
-        type: 'Feature',
-        geometry: {
-          type: 'Point',
-          coordinates: [point.longitude, point.latitude] // GeoJSON is [longitude, latitude]
-        },
-        properties: {
-          id: point.id,
-          risk_level: point.risk_level,
-          source: point.source,
-          details: point.details,
-          // You might add a numerical weight here based on risk_level if needed for the heatmap
-          // For example: weight: point.risk_level === 'High' ? 3 : point.risk_level === 'Medium' ? 2 : 1,
-        }
-      }))
-    };
-  };
-
-  useEffect(() => {
-    let mounted = true;
-    const DATA_URL = 'http://localhost:8000/dashboard-data'; // New data URL
-
-    fetch(DATA_URL)
-      .then((resp) => {
-        if (!resp.ok) {
-          throw new Error(`HTTP error! status: ${resp.status}`);
-        }
-        return resp.json();
-      })
-      .then((data) => {
-        if (!mounted) return;
-        // Convert the 'map_points' array into GeoJSON format
-        const geojson = pointsToGeoJSON(data.map_points);
-        setMapData(geojson);
-      })
-      .catch((err) => {
-        console.error('Could not load data:', err);
-        setError(err);
-      });
-
-    return () => {
-      mounted = false;
-    };
-  }, []);
+// Flood-prone zones from the same tiles
+const floodZoneLayer = {
+  id: 'flood-zones',
+  type: 'circle',
+  'source-layer': 'flood_zones',
+  paint: {
+    'circle-radius': ['interpolate', ['linear'], ['zoom'], 9, 2, 15, 8],
+    'circle-color': '#4FC3F7',
+    'circle-stroke-color': '#FFFFFF',
+    'circle-stroke-width': 1,
+    'circle-opacity': 0.7
+  }
+};
 
+const MapPage = () => {
   // Define the initial view state
   const initialViewState = {
     // Use the specified coordinates: latitude: -90, longitude: -180
@@ -96,10 +53,6 @@ const MapPage = () => {
     zoom: 12
   };
 
-  if (error) {
-    return <div className="p-4 text-red-600">Error loading map data: {error.message}</div>;
-  }
-
   return (
     <div 
       className="w-full h-full min-h-screen p-4" 
@@ -110,13 +63,13 @@ const MapPage = () => {
         style={{ width: '95%', height: '90%', borderRadius: '0.75rem', overflow: 'hidden' }} // Added rounded corners to the map itself
         mapStyle="mapbox://styles/mapbox/dark-v9"
         mapboxAccessToken={MAPBOX_TOKEN}
+        onError={(e) => console.error('Could not load map tiles:', e.error)}
       >
-        {/* Render the heatmap layer using the fetched and converted GeoJSON data */}
-        {mapData && (
-          <Source id="risk-points" type="geojson" data={mapData}>
-            <Layer {...heatmapLayer} />
-          </Source>
-        )}
+        {/* Reports and flood zones are streamed as vector tiles for the visible area only */}
+        <Source id="risk-tiles" type="vector" tiles={[TILES_URL]} minzoom={0} maxzoom={16}>
+          <Layer {...heatmapLayer} />
+          <Layer {...floodZoneLayer} />
+        </Source>
       </MapGL>
     </div>
   );